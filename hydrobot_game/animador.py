@@ -1,6 +1,6 @@
 import pygame
 import os
-from typing import Optional
+from typing import NamedTuple, Optional, cast
 
 try:
     from PIL import Image as PILImage
@@ -9,59 +9,152 @@ except ImportError:
     HAS_PIL = False
 
 
+ALTURA_LINEA_PIES = 3
+
+
+class PerfilColision(NamedTuple):
+    """Datos de colision de un fotograma, calculados al prepararlo para no rasterizar en la fisica."""
+
+    mascara: pygame.mask.Mask
+    recta: pygame.Rect
+    pies: tuple[int, int]
+    pixeles: int
+
+
+def calcular_perfil_colision(mascara: pygame.mask.Mask) -> PerfilColision:
+    ancho, alto = mascara.get_size()
+    rectangulos = cast(list[pygame.Rect], list(mascara.get_bounding_rects()))
+    if rectangulos:
+        recta = rectangulos[0].copy()
+        for otra in rectangulos[1:]:
+            recta.union_ip(otra)
+    else:
+        recta = pygame.Rect(0, 0, ancho, alto)
+    # Tramo horizontal de las ultimas filas con pixeles: lo que apoya al aterrizar.
+    columnas = [
+        x
+        for x in range(recta.left, recta.right)
+        if any(mascara.get_at((x, y)) for y in range(max(recta.top, recta.bottom - ALTURA_LINEA_PIES), recta.bottom))
+    ]
+    pies = (columnas[0], columnas[-1] + 1) if columnas else (recta.left, recta.right)
+    return PerfilColision(mascara, recta, pies, mascara.count())
+
+
+class FotogramaPreparado(NamedTuple):
+    imagen: pygame.Surface
+    perfil: PerfilColision
+
+    @property
+    def mascara(self) -> pygame.mask.Mask:
+        return self.perfil.mascara
+
+    @property
+    def recta_mascara(self) -> pygame.Rect:
+        return self.perfil.recta
+
+
+def preparar_fotograma(fotograma: pygame.Surface, tamano: tuple[int, int], volteado: bool = False) -> FotogramaPreparado:
+    imagen = pygame.transform.scale(fotograma, tamano)
+    if volteado:
+        imagen = pygame.transform.flip(imagen, True, False)
+    return FotogramaPreparado(imagen, calcular_perfil_colision(pygame.mask.from_surface(imagen)))
+
+
+def decodificar_gif(ruta_gif: str) -> tuple[list[pygame.Surface], int] | None:
+    """Decodifica los fotogramas de un GIF y su duracion en ms; no toca la pantalla, asi que sirve desde un hilo."""
+    try:
+        if not os.path.exists(ruta_gif):
+            return None
+
+        if not HAS_PIL:
+            import subprocess
+            subprocess.check_call(['pip', 'install', 'Pillow'])
+
+        from PIL import Image as PILImage
+
+        gif = PILImage.open(ruta_gif)
+        fotogramas: list[pygame.Surface] = []
+        duracion = 0
+        frame_index = 0
+
+        while True:
+            try:
+                gif.seek(frame_index)
+                fotograma_pil = gif.convert("RGBA")
+                datos = pygame.image.fromstring(
+                    fotograma_pil.tobytes(),
+                    fotograma_pil.size,
+                    "RGBA"
+                )
+                fotogramas.append(datos)
+
+                if "duration" in gif.info:
+                    duracion = gif.info["duration"]
+
+                frame_index += 1
+            except EOFError:
+                break
+    except Exception:
+        return None
+    if not fotogramas:
+        return None
+    return fotogramas, duracion
+
+
+class AnimacionDecodificada:
+    """Fotogramas de un archivo de animacion y sus versiones escaladas, compartidos por todos sus animadores."""
+
+    def __init__(self, fotogramas: list[pygame.Surface], duracion: int = 0) -> None:
+        self.fotogramas = fotogramas
+        self.duracion = duracion
+        self._tablas: dict[tuple[tuple[int, int], bool], list[FotogramaPreparado]] = {}
+
+    def preparar_fotogramas(self, tamano: tuple[int, int], volteado: bool = False) -> list[FotogramaPreparado]:
+        """Escala, voltea y enmascara todos los fotogramas una sola vez por tamano y orientacion."""
+        clave = (tamano, volteado)
+        tabla = self._tablas.get(clave)
+        if tabla is None:
+            tabla = [preparar_fotograma(fotograma, tamano, volteado) for fotograma in self.fotogramas]
+            self._tablas[clave] = tabla
+        return tabla
+
+
+_REGISTRO_ANIMACIONES: dict[str, AnimacionDecodificada] = {}
+
+
+def _crear_animacion_placeholder() -> AnimacionDecodificada:
+    placeholder = pygame.Surface((50, 50))
+    placeholder.fill((0, 180, 255))
+    return AnimacionDecodificada([placeholder])
+
+
+def obtener_animacion(ruta_gif: str) -> AnimacionDecodificada:
+    """Devuelve la animacion del registro, decodificandola la primera vez que se pide."""
+    animacion = _REGISTRO_ANIMACIONES.get(ruta_gif)
+    if animacion is None:
+        decodificado = decodificar_gif(ruta_gif)
+        if decodificado is None:
+            animacion = _crear_animacion_placeholder()
+        else:
+            animacion = AnimacionDecodificada(*decodificado)
+        _REGISTRO_ANIMACIONES[ruta_gif] = animacion
+    return animacion
+
+
 class AnimadorGif:
+    """Estado de reproduccion (fotograma, tiempo, pausa) sobre una animacion compartida del registro."""
+
     def __init__(self, ruta_gif: str, velocidad_fotogramas: int = 100) -> None:
         self.ruta_gif = ruta_gif
-        self.velocidad_fotogramas = velocidad_fotogramas
-        self.fotogramas: list[pygame.Surface] = []
+        self.animacion = obtener_animacion(ruta_gif)
+        self.velocidad_fotogramas = self.animacion.duracion if self.animacion.duracion > 0 else velocidad_fotogramas
         self.indice_fotograma = 0
         self.tiempo_transcurrido = 0.0
         self.en_reproduccion = True
-        self._cargar_gif()
-
-    def _cargar_gif(self) -> None:
-        try:
-            if not os.path.exists(self.ruta_gif):
-                self._crear_placeholder()
-                return
-            
-            if not HAS_PIL:
-                import subprocess
-                subprocess.check_call(['pip', 'install', 'Pillow'])
-            
-            from PIL import Image as PILImage
-            
-            gif = PILImage.open(self.ruta_gif)
-            duracion = 0
-            frame_index = 0
-            
-            while True:
-                try:
-                    gif.seek(frame_index)
-                    fotograma_pil = gif.convert("RGBA")
-                    datos = pygame.image.fromstring(
-                        fotograma_pil.tobytes(),
-                        fotograma_pil.size,
-                        "RGBA"
-                    )
-                    self.fotogramas.append(datos)
-                    
-                    if "duration" in gif.info:
-                        duracion = gif.info["duration"]
-                    
-                    frame_index += 1
-                except EOFError:
-                    break
-            
-            if duracion > 0:
-                self.velocidad_fotogramas = duracion
-        except Exception:
-            self._crear_placeholder()
-
-    def _crear_placeholder(self) -> None:
-        placeholder = pygame.Surface((50, 50))
-        placeholder.fill((0, 180, 255))
-        self.fotogramas = [placeholder]
+
+    @property
+    def fotogramas(self) -> list[pygame.Surface]:
+        return self.animacion.fotogramas
 
     def actualizar(self, dt: float) -> None:
         if not self.en_reproduccion or not self.fotogramas:
@@ -75,9 +168,14 @@ class AnimadorGif:
             self.indice_fotograma = (self.indice_fotograma + 1) % len(self.fotogramas)
 
     def obtener_fotograma_actual(self) -> pygame.Surface:
-        if not self.fotogramas:
-            self._crear_placeholder()
-        return self.fotogramas[self.indice_fotograma]
+        return self.fotogramas[self.indice_fotograma % len(self.fotogramas)]
+
+    def preparar_fotogramas(self, tamano: tuple[int, int], volteado: bool = False) -> list[FotogramaPreparado]:
+        return self.animacion.preparar_fotogramas(tamano, volteado)
+
+    def obtener_fotograma_preparado(self, tamano: tuple[int, int], volteado: bool = False) -> FotogramaPreparado:
+        tabla = self.preparar_fotogramas(tamano, volteado)
+        return tabla[self.indice_fotograma % len(tabla)]
 
     def pausar(self) -> None:
         self.en_reproduccion = False
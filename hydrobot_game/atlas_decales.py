@@ -0,0 +1,66 @@
+import pygame
+
+from cache_texturas import convertir_a_gris_claro, decodificar_imagen
+from rutas import ruta_recurso
+
+RUTA_ROTO1 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto1.png")
+RUTA_ROTO2 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto2.png")
+RUTA_ROTO3 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto3.png")
+RUTAS_ROTO = (RUTA_ROTO1, RUTA_ROTO2, RUTA_ROTO3)
+ROTACIONES_DECAL = (0, 90, 180, 270)
+ESCALA_DECAL = 4
+
+
+def indice_decal(nivel: int, indice_rotacion: int, reparada: bool = False) -> int:
+    """Posicion en el atlas de la variante (nivel 1-3, rotacion, danada o reparada)."""
+    nivel_limitado = max(1, min(len(RUTAS_ROTO), nivel))
+    return ((nivel_limitado - 1) * len(ROTACIONES_DECAL) + indice_rotacion % len(ROTACIONES_DECAL)) * 2 + int(reparada)
+
+
+def variante_reparada(indice: int) -> int:
+    return indice | 1
+
+
+class AtlasDecales:
+    """Todas las variantes de decal de rotura, escaladas y en gris, preparadas una sola vez.
+
+    Hay 3 niveles x 4 rotaciones x {danada, reparada}; las tuberias solo guardan
+    un indice. Si una textura no se puede leer sus variantes quedan a None.
+    """
+
+    def __init__(self) -> None:
+        self.superficies: list[pygame.Surface | None] = []
+        for ruta in RUTAS_ROTO:
+            try:
+                imagen_base: pygame.Surface | None = decodificar_imagen(ruta).convert_alpha()
+            except (pygame.error, FileNotFoundError) as error:
+                print(f"Error al cargar decal {ruta}: {error}")
+                imagen_base = None
+            for rotacion in ROTACIONES_DECAL:
+                if imagen_base is None:
+                    self.superficies.extend((None, None))
+                    continue
+                imagen = pygame.transform.rotate(imagen_base, rotacion)
+                imagen = pygame.transform.scale(
+                    imagen, (imagen.get_width() * ESCALA_DECAL, imagen.get_height() * ESCALA_DECAL)
+                )
+                self.superficies.extend((imagen, convertir_a_gris_claro(imagen)))
+
+    def __len__(self) -> int:
+        return len(self.superficies)
+
+    def obtener(self, indice: int | None) -> pygame.Surface | None:
+        if indice is None or not 0 <= indice < len(self.superficies):
+            return None
+        return self.superficies[indice]
+
+
+_ATLAS: AtlasDecales | None = None
+
+
+def obtener_atlas_decales() -> AtlasDecales:
+    """Atlas compartido por el proceso; se construye la primera vez (necesita la pantalla creada)."""
+    global _ATLAS
+    if _ATLAS is None:
+        _ATLAS = AtlasDecales()
+    return _ATLAS
@@ -0,0 +1,240 @@
+import argparse
+import math
+import os
+import random
+import time
+
+import pygame
+
+_FASES = (
+    "entrada",
+    "jugador",
+    "tuberias",
+    "particulas",
+    "extensores",
+    "render_mundo",
+    "minimapa",
+    "flip",
+    "total",
+)
+
+# (cuadro_inicio, cuadro_fin, teclas pulsadas); el guion se repite en bucle.
+GUION_POR_DEFECTO: list[tuple[int, int, tuple[int, ...]]] = [
+    (0, 120, (pygame.K_d,)),
+    (60, 64, (pygame.K_w,)),
+    (120, 240, (pygame.K_a, pygame.K_LSHIFT)),
+    (180, 184, (pygame.K_w,)),
+    (250, 252, (pygame.K_l,)),
+    (260, 380, (pygame.K_d,)),
+    (300, 302, (pygame.K_k,)),
+    (430, 432, (pygame.K_l,)),
+    (440, 560, (pygame.K_a,)),
+    (560, 562, (pygame.K_l,)),
+    (570, 600, (pygame.K_s,)),
+]
+
+
+class TecladoGuionado:
+    """Sustituye a pygame.key.get_pressed con un conjunto fijo de teclas."""
+
+    def __init__(self, pulsadas: set[int] | None = None) -> None:
+        self.pulsadas: set[int] = pulsadas or set()
+
+    def __getitem__(self, tecla: int) -> bool:
+        return tecla in self.pulsadas
+
+
+def _teclas_en_cuadro(guion: list[tuple[int, int, tuple[int, ...]]], cuadro: int) -> tuple[set[int], set[int]]:
+    duracion = max((fin for _, fin, _ in guion), default=0)
+    if duracion <= 0:
+        return set(), set()
+    cuadro_local = cuadro % duracion
+    pulsadas: set[int] = set()
+    nuevas: set[int] = set()
+    for inicio, fin, teclas in guion:
+        if inicio <= cuadro_local < fin:
+            pulsadas.update(teclas)
+            if cuadro_local == inicio:
+                nuevas.update(teclas)
+    return pulsadas, nuevas
+
+
+def _percentil(valores_ordenados: list[float], porcentaje: float) -> float:
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, math.ceil(porcentaje / 100.0 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+def resumir_tiempos(tiempos: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    resumen: dict[str, dict[str, float]] = {}
+    for fase, valores in tiempos.items():
+        ordenados = sorted(valores)
+        media = sum(ordenados) / len(ordenados) if ordenados else 0.0
+        resumen[fase] = {
+            "media": media,
+            "p50": _percentil(ordenados, 50),
+            "p95": _percentil(ordenados, 95),
+            "p99": _percentil(ordenados, 99),
+        }
+    return resumen
+
+
+def imprimir_resumen(resumen: dict[str, dict[str, float]], etiqueta: str, cuadros: int) -> None:
+    print(f"Escena {etiqueta}: {cuadros} cuadros (ms)")
+    print(f"{'fase':<14}{'media':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for fase, datos in resumen.items():
+        print(
+            f"{fase:<14}"
+            f"{datos['media'] * 1000:>9.3f}"
+            f"{datos['p50'] * 1000:>9.3f}"
+            f"{datos['p95'] * 1000:>9.3f}"
+            f"{datos['p99'] * 1000:>9.3f}"
+        )
+
+
+def ejecutar_benchmark(
+    etiqueta: str = "1",
+    cuadros: int = 600,
+    dt: float = 1.0 / 60.0,
+    guion: list[tuple[int, int, tuple[int, ...]]] | None = None,
+    semilla: int = 0,
+    mostrar: bool = True,
+) -> dict[str, dict[str, float]]:
+    """Juega una escena sin ventana ni audio con entradas guionadas y mide cada fase del cuadro."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from capa_estatica import CapaEstatica
+    from configuracion import RUTA_MUSICA_MENU, TAMANO_VENTANA
+    from entorno import actualizar_camara, crear_entorno, manejar_extensor_soltado
+    from gestor_sonido import GestorSonido
+    from fondo_nivel import cargar_imagen_fondo, crear_fondo_nivel
+    from main import obtener_datos_escena
+    from minimapa import MiniMapa
+    from render_mundo import dibujar_mundo
+    from temporizador import planificador
+
+    datos_escena = obtener_datos_escena(etiqueta)
+    if datos_escena is None:
+        raise ValueError(f"Escena desconocida: {etiqueta}")
+    configuracion, ruta_mapeado, minimo_rotas = datos_escena
+
+    pygame.init()
+    pantalla = pygame.display.set_mode(TAMANO_VENTANA)
+    recta_pantalla = pantalla.get_rect()
+    random.seed(semilla)
+    gestor = GestorSonido(RUTA_MUSICA_MENU)
+
+    (
+        jugador,
+        _grupo_sprites,
+        grupo_extensores,
+        grupo_plataformas,
+        grupo_tuberias,
+        sistema_particulas,
+        limites_movimiento,
+        altura_mundo,
+        _ancho_mundo,
+        desplazamiento_camara,
+        _datos_nivel,
+    ) = crear_entorno(recta_pantalla, configuracion, ruta_mapeado, gestor, minimo_rotas)
+    fondo_nivel = crear_fondo_nivel(cargar_imagen_fondo(), recta_pantalla, limites_movimiento, altura_mundo)
+    capa_estatica = CapaEstatica(grupo_plataformas, grupo_tuberias)
+    minimapa = MiniMapa()
+    minimapa.establecer_limites(limites_movimiento)
+
+    guion_activo = guion if guion is not None else GUION_POR_DEFECTO
+    teclado = TecladoGuionado()
+    tiempos: dict[str, list[float]] = {fase: [] for fase in _FASES}
+    reloj = time.perf_counter
+
+    for cuadro in range(cuadros):
+        inicio_cuadro = reloj()
+
+        t0 = reloj()
+        pygame.event.pump()
+        teclado.pulsadas, nuevas = _teclas_en_cuadro(guion_activo, cuadro)
+        if pygame.K_l in nuevas:
+            for extensor in grupo_extensores:
+                if hasattr(extensor, "ordenar_ir_a_jugador"):
+                    extensor.ordenar_ir_a_jugador(jugador)
+        if pygame.K_k in nuevas:
+            for extensor in grupo_extensores:
+                if hasattr(extensor, "ordenar_reparar"):
+                    extensor.ordenar_reparar(jugador)
+        t1 = reloj()
+        tiempos["entrada"].append(t1 - t0)
+
+        planificador.avanzar(dt)
+        t2 = reloj()
+        tiempos["tuberias"].append(t2 - t1)
+
+        jugador.update(teclado, dt, limites_movimiento, grupo_extensores, grupo_plataformas, grupo_tuberias)  # type: ignore[arg-type]
+        actualizar_camara(desplazamiento_camara, jugador.rect, limites_movimiento, altura_mundo, recta_pantalla)
+        manejar_extensor_soltado(jugador, grupo_extensores)
+        t3 = reloj()
+        tiempos["jugador"].append(t3 - t2)
+
+        sistema_particulas.update(dt)
+        t4 = reloj()
+        tiempos["particulas"].append(t4 - t3)
+
+        grupo_extensores.update(dt, grupo_plataformas, limites_movimiento)
+        t5 = reloj()
+        tiempos["extensores"].append(t5 - t4)
+
+        if fondo_nivel is not None:
+            fondo_nivel.dibujar(pantalla, desplazamiento_camara)
+        else:
+            pantalla.fill(configuracion["color_fondo"])
+        dibujar_mundo(
+            pantalla,
+            desplazamiento_camara,
+            grupo_plataformas,
+            grupo_tuberias,
+            sistema_particulas,
+            grupo_extensores,
+            capa_estatica,
+        )
+        pantalla.blit(
+            jugador.image,
+            (int(jugador.rect.x - desplazamiento_camara.x), int(jugador.rect.y - desplazamiento_camara.y)),
+        )
+        t6 = reloj()
+        tiempos["render_mundo"].append(t6 - t5)
+
+        minimapa.dibujar(
+            pantalla,
+            jugador,
+            grupo_plataformas,
+            grupo_tuberias,
+            grupo_extensores,
+            desplazamiento_camara,
+            recta_pantalla,
+        )
+        t7 = reloj()
+        tiempos["minimapa"].append(t7 - t6)
+
+        pygame.display.flip()
+        t8 = reloj()
+        tiempos["flip"].append(t8 - t7)
+        tiempos["total"].append(t8 - inicio_cuadro)
+
+    gestor.limpiar()
+    pygame.quit()
+
+    resumen = resumir_tiempos(tiempos)
+    if mostrar:
+        imprimir_resumen(resumen, etiqueta, cuadros)
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sin ventana de una escena de Hydrobot.")
+    parser.add_argument("escena", nargs="?", default="1", help="1, 2, 3 o tutorial")
+    parser.add_argument("--cuadros", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=1.0 / 60.0)
+    parser.add_argument("--semilla", type=int, default=0)
+    argumentos = parser.parse_args()
+    ejecutar_benchmark(argumentos.escena, argumentos.cuadros, argumentos.dt, semilla=argumentos.semilla)
@@ -1,5 +1,7 @@
 import pygame
 
+from cache_texto import renderizar_texto
+
 
 class Boton:
     def __init__(self, texto: str, centro: tuple[int, int], tamano: tuple[int, int], textura: pygame.Surface | str | None = None) -> None:
@@ -8,6 +10,9 @@ class Boton:
         self.recta.center = centro
         self.color_base = (72, 82, 110)
         self.color_resaltado = (110, 130, 170)
+        self.resaltado = False
+        self.necesita_redibujar = True
+        self._capa_resaltado: pygame.Surface | None = None
         self.textura: pygame.Surface | None = None
         if isinstance(textura, pygame.Surface):
             self.textura = pygame.transform.smoothscale(textura, self.recta.size)
@@ -20,22 +25,31 @@ class Boton:
         else:
             self.textura = None
 
-    def dibujar(self, superficie: pygame.Surface, fuente: pygame.font.Font) -> None:
-        posicion_raton = pygame.mouse.get_pos()
+    def actualizar_resaltado(self, posicion_raton: tuple[int, int]) -> bool:
+        """Actualiza el estado de hover; devuelve True si cambio y hay que redibujar el boton."""
         resaltado = self.recta.collidepoint(posicion_raton)
+        if resaltado != self.resaltado:
+            self.resaltado = resaltado
+            self.necesita_redibujar = True
+        return self.necesita_redibujar
+
+    def dibujar(self, superficie: pygame.Surface, fuente: pygame.font.Font) -> None:
+        self.resaltado = self.recta.collidepoint(pygame.mouse.get_pos())
         if self.textura:
             superficie.blit(self.textura, self.recta.topleft)
-            if resaltado:
-                capa_resaltado = pygame.Surface(self.recta.size, pygame.SRCALPHA)
-                capa_resaltado.fill((40, 45, 60, 90))
-                superficie.blit(capa_resaltado, self.recta.topleft)
+            if self.resaltado:
+                if self._capa_resaltado is None or self._capa_resaltado.get_size() != self.recta.size:
+                    self._capa_resaltado = pygame.Surface(self.recta.size, pygame.SRCALPHA)
+                    self._capa_resaltado.fill((40, 45, 60, 90))
+                superficie.blit(self._capa_resaltado, self.recta.topleft)
         else:
-            color_actual = self.color_resaltado if resaltado else self.color_base
+            color_actual = self.color_resaltado if self.resaltado else self.color_base
             pygame.draw.rect(superficie, color_actual, self.recta, border_radius=10)
             pygame.draw.rect(superficie, (18, 20, 28), self.recta, 2, border_radius=10)
-        texto_render = fuente.render(self.texto, True, (230, 230, 235))
+        texto_render = renderizar_texto(fuente, self.texto, True, (230, 230, 235))
         recta_texto = texto_render.get_rect(center=self.recta.center)
         superficie.blit(texto_render, recta_texto)
+        self.necesita_redibujar = False
 
     def fue_clic(self, evento: pygame.event.Event) -> bool:
         return (
@@ -0,0 +1,64 @@
+import hashlib
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from rutas import ruta_cache
+
+_MAGIA = b"HBNV"
+_VERSION = 1
+_CABECERA = struct.Struct("<4sHII")
+_EXTENSION = ".nivel"
+
+_NIVELES_EN_MEMORIA: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+
+def calcular_hash_mapa(ruta_imagen: str) -> str | None:
+    try:
+        with open(ruta_imagen, "rb") as archivo:
+            return hashlib.sha1(archivo.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _ruta_nivel_compilado(hash_mapa: str) -> Path:
+    return Path(ruta_cache("niveles", hash_mapa + _EXTENSION))
+
+
+def cargar_nivel_compilado(hash_mapa: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """Devuelve (tipos, variantes) de un mapa ya compilado, o None si no esta en cache."""
+    en_memoria = _NIVELES_EN_MEMORIA.get(hash_mapa)
+    if en_memoria is not None:
+        return en_memoria
+    try:
+        datos = _ruta_nivel_compilado(hash_mapa).read_bytes()
+    except OSError:
+        return None
+    if len(datos) < _CABECERA.size:
+        return None
+    magia, version, ancho, alto = _CABECERA.unpack_from(datos)
+    celdas = ancho * alto
+    if magia != _MAGIA or version != _VERSION or len(datos) != _CABECERA.size + celdas * 2:
+        return None
+    cuerpo = np.frombuffer(datos, dtype=np.uint8, offset=_CABECERA.size)
+    tipos = cuerpo[:celdas].reshape(alto, ancho)
+    variantes = cuerpo[celdas:].reshape(alto, ancho)
+    _NIVELES_EN_MEMORIA[hash_mapa] = (tipos, variantes)
+    return tipos, variantes
+
+
+def guardar_nivel_compilado(hash_mapa: str, tipos: np.ndarray, variantes: np.ndarray) -> None:
+    alto, ancho = tipos.shape
+    _NIVELES_EN_MEMORIA[hash_mapa] = (tipos, variantes)
+    ruta = _ruta_nivel_compilado(hash_mapa)
+    ruta_temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(_CABECERA.pack(_MAGIA, _VERSION, ancho, alto))
+            archivo.write(np.ascontiguousarray(tipos, dtype=np.uint8).tobytes())
+            archivo.write(np.ascontiguousarray(variantes, dtype=np.uint8).tobytes())
+        ruta_temporal.replace(ruta)
+    except OSError as error:
+        print(f"No se pudo guardar el nivel compilado: {error}")
@@ -0,0 +1,61 @@
+import pygame
+from collections import OrderedDict
+
+_CAPACIDAD = 256
+
+ClaveTexto = tuple[pygame.font.Font, str, bool, tuple[int, ...]]
+
+
+class CacheTexto:
+    """Cache LRU de textos ya rasterizados, indexada por (fuente, texto, antialias, color)."""
+
+    def __init__(self, capacidad: int = _CAPACIDAD) -> None:
+        self.capacidad = max(1, capacidad)
+        self._superficies: OrderedDict[ClaveTexto, pygame.Surface] = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._superficies)
+
+    def render(
+        self,
+        fuente: pygame.font.Font,
+        texto: str,
+        antialias: bool,
+        color: tuple[int, ...] | pygame.Color,
+    ) -> pygame.Surface:
+        """Como `fuente.render`, pero devuelve la misma superficie para el mismo texto; no modificarla."""
+        clave = (fuente, texto, antialias, tuple(color))
+        superficie = self._superficies.get(clave)
+        if superficie is not None:
+            self._superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+        self.fallos += 1
+        superficie = fuente.render(texto, antialias, color)
+        self._superficies[clave] = superficie
+        if len(self._superficies) > self.capacidad:
+            self._superficies.popitem(last=False)
+        return superficie
+
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def limpiar(self) -> None:
+        self._superficies.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+
+cache_texto = CacheTexto()
+
+
+def renderizar_texto(
+    fuente: pygame.font.Font,
+    texto: str,
+    antialias: bool,
+    color: tuple[int, ...] | pygame.Color,
+) -> pygame.Surface:
+    return cache_texto.render(fuente, texto, antialias, color)
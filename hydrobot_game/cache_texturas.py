@@ -0,0 +1,116 @@
+import numpy as np
+import pygame
+from typing import NamedTuple, cast
+
+
+class Repisa(NamedTuple):
+    """Superficie de aterrizaje de un solo sentido: tramo [izquierda, derecha) a la altura y."""
+
+    izquierda: int
+    derecha: int
+    y: int
+
+
+class TexturaTile(NamedTuple):
+    imagen_original: pygame.Surface
+    imagen: pygame.Surface
+    mascara: pygame.mask.Mask
+    repisas: tuple[Repisa, ...]
+
+
+_CACHE_TILES: dict[tuple[str, int, int], TexturaTile] = {}
+_IMAGENES_DECODIFICADAS: dict[str, pygame.Surface] = {}
+_RUTAS_PREPARADAS: set[str] = set()
+
+
+def reducir_mascara_superior(mascara: pygame.mask.Mask, reduccion: int) -> None:
+    if reduccion <= 0:
+        return
+    ancho, alto = mascara.get_size()
+    if ancho == 0 or alto == 0:
+        return
+    rectangulos = cast(list[pygame.Rect], list(mascara.get_bounding_rects()))
+    if not rectangulos:
+        return
+    recta_colision = rectangulos[0].copy()
+    for recta in rectangulos[1:]:
+        recta_colision.union_ip(recta)
+    if recta_colision.height == 0:
+        return
+    alto_recorte = min(reduccion, recta_colision.height)
+    recorte = pygame.mask.Mask((recta_colision.width, alto_recorte), fill=True)
+    mascara.erase(recorte, recta_colision.topleft)
+
+
+def compilar_repisas(mascara: pygame.mask.Mask) -> tuple[Repisa, ...]:
+    """Convierte la mascara ya recortada en repisas, relativas a la esquina del tile.
+
+    Cada tramo de columnas consecutivas con pixeles es una repisa a la altura del
+    pixel mas alto del tramo, que es donde la mascara empezaba a colisionar.
+    """
+    ancho, alto = mascara.get_size()
+    repisas: list[Repisa] = []
+    inicio: int | None = None
+    y_tramo = alto
+    for x in range(ancho + 1):
+        y_columna = next((y for y in range(alto) if mascara.get_at((x, y))), None) if x < ancho else None
+        if y_columna is None:
+            if inicio is not None:
+                repisas.append(Repisa(inicio, x, y_tramo))
+                inicio = None
+            continue
+        if inicio is None:
+            inicio = x
+            y_tramo = y_columna
+        else:
+            y_tramo = min(y_tramo, y_columna)
+    return tuple(repisas)
+
+
+def decodificar_imagen(ruta: str) -> pygame.Surface:
+    """Lee la imagen del disco sin convertirla al formato de pantalla; se puede llamar desde otro hilo."""
+    imagen = _IMAGENES_DECODIFICADAS.get(ruta)
+    if imagen is None:
+        imagen = pygame.image.load(ruta)
+        _IMAGENES_DECODIFICADAS[ruta] = imagen
+    return imagen
+
+
+def textura_tile_preparada(ruta: str) -> bool:
+    """Cierto si algun tile de `ruta` ya esta en la cache y no hace falta volver a decodificarla."""
+    return ruta in _RUTAS_PREPARADAS
+
+
+def obtener_textura_tile(ruta: str, escala: int, reduccion_superior: int = 0) -> TexturaTile:
+    """Devuelve la textura escalada y su mascara recortada, compartidas por todos los tiles iguales."""
+    clave = (ruta, escala, reduccion_superior)
+    textura = _CACHE_TILES.get(clave)
+    if textura is not None:
+        return textura
+    imagen_original = decodificar_imagen(ruta).convert_alpha()
+    _IMAGENES_DECODIFICADAS.pop(ruta, None)
+    ancho_escalado = int(imagen_original.get_width() * escala)
+    alto_escalado = int(imagen_original.get_height() * escala)
+    imagen = pygame.transform.scale(imagen_original, (ancho_escalado, alto_escalado))
+    mascara = pygame.mask.from_surface(imagen)
+    reducir_mascara_superior(mascara, reduccion_superior)
+    textura = TexturaTile(imagen_original, imagen, mascara, compilar_repisas(mascara))
+    _CACHE_TILES[clave] = textura
+    _RUTAS_PREPARADAS.add(ruta)
+    return textura
+
+
+def convertir_a_gris_claro(superficie: pygame.Surface) -> pygame.Surface:
+    """Copia de `superficie` en gris aclarado, conservando el alfa; opera sobre el buffer con numpy."""
+    superficie_gris = superficie.copy()
+    pixeles = pygame.surfarray.pixels3d(superficie_gris)
+    alfa = pygame.surfarray.pixels_alpha(superficie_gris)
+    try:
+        visibles = alfa > 0
+        rgb = pixeles[visibles].astype(np.float64)
+        gris_base = (rgb[:, 0] * 0.299 + rgb[:, 1] * 0.587 + rgb[:, 2] * 0.114).astype(np.int32)
+        gris_claro = np.minimum(255, (gris_base * 0.4 + 150).astype(np.int32)).astype(np.uint8)
+        pixeles[visibles] = gris_claro[:, None]
+    finally:
+        del pixeles, alfa
+    return superficie_gris
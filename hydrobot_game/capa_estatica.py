@@ -0,0 +1,135 @@
+import pygame
+from collections import OrderedDict
+
+from indice_espacial import GrupoEspacial, sprites_cercanos
+
+_TAMANO_BLOQUE = 512
+_MAX_BLOQUES = 16
+
+
+def es_sprite_estatico(sprite: pygame.sprite.Sprite) -> bool:
+    metodo = getattr(sprite, "es_estatica", None)
+    if callable(metodo):
+        return bool(metodo())
+    return True
+
+
+class CapaEstatica:
+    """Pre-renderiza plataformas y tuberias quietas en bloques que se dibujan sobre el fondo.
+
+    Cada bloque se hornea la primera vez que entra en camara y solo se vuelve a
+    hornear cuando algo dentro de el cambia (una tuberia reparada, que empieza o
+    termina de caer). Se conservan como maximo `max_bloques` bloques en memoria.
+    """
+
+    def __init__(
+        self,
+        grupo_plataformas: pygame.sprite.Group | None,
+        grupo_tuberias: pygame.sprite.Group | None,
+        tamano_bloque: int = _TAMANO_BLOQUE,
+        max_bloques: int = _MAX_BLOQUES,
+    ) -> None:
+        self.grupo_plataformas = grupo_plataformas
+        self.grupo_tuberias = grupo_tuberias
+        self.tamano_bloque = max(1, tamano_bloque)
+        self.max_bloques = max(1, max_bloques)
+        self._bloques: OrderedDict[tuple[int, int], pygame.Surface | None] = OrderedDict()
+        self._estado_estatico: dict[pygame.sprite.Sprite, bool] = {}
+        self.horneados = 0
+        for grupo in (grupo_plataformas, grupo_tuberias):
+            if isinstance(grupo, GrupoEspacial):
+                grupo.observadores.append(self._al_cambiar_sprite)
+
+    def desconectar(self) -> None:
+        for grupo in (self.grupo_plataformas, self.grupo_tuberias):
+            if isinstance(grupo, GrupoEspacial) and self._al_cambiar_sprite in grupo.observadores:
+                grupo.observadores.remove(self._al_cambiar_sprite)
+        self._bloques.clear()
+        self._estado_estatico.clear()
+
+    def es_estatico(self, sprite: pygame.sprite.Sprite) -> bool:
+        return es_sprite_estatico(sprite)
+
+    def _bloques_en(self, recta: pygame.Rect) -> list[tuple[int, int]]:
+        tamano = self.tamano_bloque
+        return [
+            (columna, fila)
+            for fila in range(recta.top // tamano, (recta.bottom - 1) // tamano + 1)
+            for columna in range(recta.left // tamano, (recta.right - 1) // tamano + 1)
+        ]
+
+    def invalidar(self, recta: pygame.Rect) -> None:
+        if recta.width <= 0 or recta.height <= 0:
+            return
+        for clave in self._bloques_en(recta):
+            self._bloques.pop(clave, None)
+
+    def _al_cambiar_sprite(self, sprite: pygame.sprite.Sprite, recta_anterior: pygame.Rect | None) -> None:
+        estatico = self.es_estatico(sprite)
+        era_estatico = self._estado_estatico.get(sprite, True)
+        self._estado_estatico[sprite] = estatico
+        if not estatico and not era_estatico:
+            return
+        if recta_anterior is not None:
+            self.invalidar(recta_anterior)
+        self.invalidar(sprite.rect)
+
+    def _hornear_bloque(self, clave: tuple[int, int]) -> pygame.Surface | None:
+        recta_bloque = pygame.Rect(
+            clave[0] * self.tamano_bloque,
+            clave[1] * self.tamano_bloque,
+            self.tamano_bloque,
+            self.tamano_bloque,
+        )
+        superficie: pygame.Surface | None = None
+        for grupo in (self.grupo_plataformas, self.grupo_tuberias):
+            if not grupo:
+                continue
+            for sprite in sprites_cercanos(grupo, recta_bloque):
+                if not sprite.rect.colliderect(recta_bloque) or not self.es_estatico(sprite):
+                    continue
+                self._estado_estatico[sprite] = True
+                if superficie is None:
+                    superficie = pygame.Surface(recta_bloque.size, pygame.SRCALPHA).convert_alpha()
+                    superficie.fill((0, 0, 0, 0))
+                superficie.blit(sprite.image, (sprite.rect.x - recta_bloque.x, sprite.rect.y - recta_bloque.y))
+                obtener_decal = getattr(sprite, "obtener_decal", None)
+                if callable(obtener_decal):
+                    resultado = obtener_decal()
+                    if resultado is not None:
+                        decal_superficie, decal_rect = resultado
+                        superficie.blit(decal_superficie, (decal_rect.x - recta_bloque.x, decal_rect.y - recta_bloque.y))
+        self.horneados += 1
+        return superficie
+
+    def _obtener_bloque(self, clave: tuple[int, int]) -> pygame.Surface | None:
+        if clave in self._bloques:
+            self._bloques.move_to_end(clave)
+            return self._bloques[clave]
+        superficie = self._hornear_bloque(clave)
+        self._bloques[clave] = superficie
+        while len(self._bloques) > self.max_bloques:
+            self._bloques.popitem(last=False)
+        return superficie
+
+    def preparar(self, recta: pygame.Rect) -> None:
+        """Hornea por adelantado los bloques que cubren `recta`, normalmente la vista inicial."""
+        for clave in self._bloques_en(recta)[: self.max_bloques]:
+            self._obtener_bloque(clave)
+
+    def dibujar(self, pantalla: pygame.Surface, desplazamiento_camara: pygame.math.Vector2) -> int:
+        """Dibuja los bloques visibles y devuelve cuantos se blitearon."""
+        offset_x = desplazamiento_camara.x
+        offset_y = desplazamiento_camara.y
+        recta_camara = pygame.Rect(int(offset_x), int(offset_y), pantalla.get_width(), pantalla.get_height())
+        dibujados = 0
+        for clave in self._bloques_en(recta_camara):
+            superficie = self._obtener_bloque(clave)
+            if superficie is None:
+                continue
+            pantalla.blit(
+                superficie,
+                (int(clave[0] * self.tamano_bloque - offset_x), int(clave[1] * self.tamano_bloque - offset_y)),
+            )
+            dibujados += 1
+        return dibujados
@@ -0,0 +1,89 @@
+import threading
+from typing import Callable
+
+import pygame
+
+from animador import obtener_animacion
+from atlas_decales import RUTAS_ROTO
+from cache_texto import renderizar_texto
+from cache_texturas import decodificar_imagen, textura_tile_preparada
+from extensor import RUTA_EXTENSOR
+from generador_nivel import RUTAS_VARIANTE_TUBERIA, obtener_clasificacion_mapa
+from plataforma import RUTA_PLATAFORMA
+from player import RUTAS_ANIMACIONES_JUGADOR
+
+
+def _decodificar_texturas() -> None:
+    for ruta in (RUTA_PLATAFORMA, *RUTAS_VARIANTE_TUBERIA.values(), *RUTAS_ROTO):
+        if textura_tile_preparada(ruta):
+            continue
+        try:
+            decodificar_imagen(ruta)
+        except (pygame.error, FileNotFoundError):
+            # Se vuelve a intentar (y se informa) al crear los sprites en el hilo principal.
+            continue
+
+
+def _decodificar_animaciones() -> None:
+    for ruta in (*RUTAS_ANIMACIONES_JUGADOR, RUTA_EXTENSOR):
+        obtener_animacion(ruta)
+
+
+class CargaEscena:
+    """Prepara en un hilo aparte todo lo que no necesita la pantalla para abrir una escena.
+
+    El hilo lee y clasifica el mapeado y decodifica texturas y GIFs; el hilo
+    principal sigue dibujando la pantalla de carga y, cuando `terminada` es
+    cierto, crea los sprites y convierte las superficies al formato de pantalla.
+    """
+
+    def __init__(self, etiqueta: str, ruta_mapeado: str) -> None:
+        self.etiqueta = etiqueta
+        self.ruta_mapeado = ruta_mapeado
+        self.progreso = 0.0
+        self.error: str | None = None
+        self._pasos: list[Callable[[], object]] = [
+            lambda: obtener_clasificacion_mapa(self.ruta_mapeado),
+            _decodificar_texturas,
+            _decodificar_animaciones,
+        ]
+        self._terminada = threading.Event()
+        self._hilo = threading.Thread(target=self._trabajar, name=f"carga-escena-{etiqueta}", daemon=True)
+
+    def iniciar(self) -> None:
+        self._hilo.start()
+
+    @property
+    def terminada(self) -> bool:
+        return self._terminada.is_set()
+
+    def _trabajar(self) -> None:
+        try:
+            for indice, paso in enumerate(self._pasos):
+                paso()
+                self.progreso = (indice + 1) / len(self._pasos)
+        except Exception as error:
+            self.error = f"{type(error).__name__}: {error}"
+        finally:
+            self.progreso = 1.0
+            self._terminada.set()
+
+
+def dibujar_pantalla_carga(
+    pantalla: pygame.Surface,
+    fuente: pygame.font.Font,
+    progreso: float,
+    color_fondo: tuple[int, int, int],
+) -> None:
+    recta_pantalla = pantalla.get_rect()
+    pantalla.fill(color_fondo)
+    texto = renderizar_texto(fuente, "Cargando...", True, (235, 235, 240))
+    pantalla.blit(texto, texto.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery - 40)))
+    recta_barra = pygame.Rect(0, 0, recta_pantalla.width // 2, 18)
+    recta_barra.center = (recta_pantalla.centerx, recta_pantalla.centery + 20)
+    pygame.draw.rect(pantalla, (60, 70, 90), recta_barra, border_radius=6)
+    recta_relleno = recta_barra.copy()
+    recta_relleno.width = int(recta_barra.width * max(0.0, min(1.0, progreso)))
+    if recta_relleno.width > 0:
+        pygame.draw.rect(pantalla, (90, 200, 255), recta_relleno, border_radius=6)
+    pygame.draw.rect(pantalla, (200, 210, 230), recta_barra, 2, border_radius=6)
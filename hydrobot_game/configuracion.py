@@ -10,6 +10,9 @@ class ConfiguracionEscena(TypedDict):
 
 
 TAMANO_VENTANA: tuple[int, int] = (700, 700)
+# La simulacion va a paso fijo (paso_fijo.py); el dibujado puede ir mas rapido.
+FPS_MAXIMO = 120
+FPS_MENU = 30
 RUTA_MUSICA_MENU = ruta_recurso("sonido", "musica", "menu.mp3")
 RUTA_MUSICA_ESCENA1 = ruta_recurso("sonido", "musica", "ecn1.mp3")
 RUTA_MUSICA_ESCENA2 = ruta_recurso("sonido", "musica", "ecn2.mp3")
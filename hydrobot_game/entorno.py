@@ -1,16 +1,45 @@
 import pygame
 
+from atlas_decales import obtener_atlas_decales
 from configuracion import ConfiguracionEscena
 from extensor import Extensor
 from gestor_sonido import GestorSonido
+from particula import SistemaParticulas
 from plataforma import Plataforma
 from player import Jugador
+from temporizador import planificador
 
 
 def limitar(valor: float, minimo: float, maximo: float) -> float:
     return max(minimo, min(valor, maximo))
 
 
+def actualizar_camara(
+    desplazamiento_camara: pygame.math.Vector2,
+    recta_objetivo: pygame.Rect,
+    limites: pygame.Rect,
+    altura_mundo: int,
+    recta_pantalla: pygame.Rect,
+) -> None:
+    mundo_izquierda = limites.left
+    mundo_ancho = limites.width
+    mundo_derecha = limites.right
+    max_scroll_x = mundo_derecha - recta_pantalla.width
+    if max_scroll_x <= mundo_izquierda:
+        centro_mundo_x = mundo_izquierda + mundo_ancho / 2
+        desplazamiento_camara.x = max(0.0, centro_mundo_x - recta_pantalla.width / 2)
+    else:
+        objetivo_x = recta_objetivo.centerx - recta_pantalla.width / 2
+        desplazamiento_camara.x = limitar(objetivo_x, mundo_izquierda, max_scroll_x)
+
+    max_scroll_y = altura_mundo - recta_pantalla.height
+    if max_scroll_y <= 0:
+        desplazamiento_camara.y = 0.0
+    else:
+        objetivo_y = recta_objetivo.centery - recta_pantalla.height / 2
+        desplazamiento_camara.y = limitar(objetivo_y, 0.0, max_scroll_y)
+
+
 def encontrar_plataforma_mas_baja(grupo_plataformas: pygame.sprite.Group, altura_mundo: int) -> Plataforma | None:
     if not grupo_plataformas:
         return None
@@ -53,7 +82,7 @@ def crear_entorno(
     pygame.sprite.Group,
     pygame.sprite.Group,
     pygame.sprite.Group,
-    pygame.sprite.Group,
+    SistemaParticulas,
     pygame.Rect,
     int,
     int,
@@ -62,14 +91,18 @@ def crear_entorno(
 ]:
     from generador_nivel import generar_nivel_desde_imagen
 
+    # Los plazos de la escena anterior no sobreviven al cambio de nivel.
+    planificador.limpiar()
+    obtener_atlas_decales()
+    sistema_particulas = SistemaParticulas()
     grupo_plataformas, grupo_tuberias, altura_mundo, desplazamiento_x, ancho_mundo, datos_extra = generar_nivel_desde_imagen(
         ruta_mapeado,
         100,
         recta_pantalla.width,
         minimo_rotas,
         gestor_sonido=gestor_sonido,
+        sistema_particulas=sistema_particulas,
     )
-    grupo_particulas = pygame.sprite.Group()
     limites = pygame.Rect(desplazamiento_x, 0, ancho_mundo, altura_mundo)
     plataforma_spawn = encontrar_plataforma_mas_baja(grupo_plataformas, altura_mundo)
     if plataforma_spawn is not None:
@@ -81,25 +114,14 @@ def crear_entorno(
     grupo_sprites.add(jugador)
     grupo_extensores = pygame.sprite.Group()
     desplazamiento_camara = pygame.math.Vector2(0.0, 0.0)
-    max_scroll_y = altura_mundo - recta_pantalla.height
-    if max_scroll_y > 0:
-        desplazamiento_camara.y = limitar(jugador.rect.centery - recta_pantalla.height / 2, 0.0, max_scroll_y)
-    mundo_izquierda = limites.left
-    mundo_ancho = limites.width
-    mundo_derecha = limites.right
-    max_scroll_x = mundo_derecha - recta_pantalla.width
-    if max_scroll_x <= mundo_izquierda:
-        centro_mundo_x = mundo_izquierda + mundo_ancho / 2
-        desplazamiento_camara.x = max(0.0, centro_mundo_x - recta_pantalla.width / 2)
-    else:
-        desplazamiento_camara.x = limitar(jugador.rect.centerx - recta_pantalla.width / 2, mundo_izquierda, max_scroll_x)
+    actualizar_camara(desplazamiento_camara, jugador.rect, limites, altura_mundo, recta_pantalla)
     return (
         jugador,
         grupo_sprites,
         grupo_extensores,
         grupo_plataformas,
         grupo_tuberias,
-        grupo_particulas,
+        sistema_particulas,
         limites,
         altura_mundo,
         ancho_mundo,
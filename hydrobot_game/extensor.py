@@ -2,8 +2,10 @@
 import pygame
 from typing import Optional, TYPE_CHECKING
 from animador import AnimadorGif
-from sprite_base import SpriteConMascara
+from indice_espacial import sprites_cercanos
+from sprite_base import SpriteConMascara, altura_aterrizaje
 from rutas import ruta_recurso
+from temporizador import Temporizador, planificador
 
 if TYPE_CHECKING:
     from gestor_sonido import GestorSonido
@@ -26,11 +28,14 @@ class Extensor(SpriteConMascara):
     ) -> None:
         super().__init__(*grupos)
         self.animador = AnimadorGif(RUTA_EXTENSOR, velocidad_fotogramas=100)
-        self.image: pygame.Surface = self._escalar_fotograma(self.animador.obtener_fotograma_actual())
+        self.animador.preparar_fotogramas((TAMANO_EXTENSOR, TAMANO_EXTENSOR), False)
+        self.animador.preparar_fotogramas((TAMANO_EXTENSOR, TAMANO_EXTENSOR), True)
+        fotograma_inicial = self.animador.obtener_fotograma_preparado((TAMANO_EXTENSOR, TAMANO_EXTENSOR))
+        self.image: pygame.Surface = fotograma_inicial.imagen
         self.rect: pygame.Rect = self.image.get_rect(topleft=posicion)
         self.posicion = pygame.math.Vector2(float(posicion[0]), float(posicion[1]))
         self.direccion = 1
-        self.mascara = pygame.mask.from_surface(self.image)
+        self.establecer_perfil(fotograma_inicial.perfil)
         self.velocidad_movimiento = 180.0
         self.moviendo = False
         self.objetivo_jugador: pygame.sprite.Sprite | None = None
@@ -39,13 +44,15 @@ class Extensor(SpriteConMascara):
         self.velocidad_caida_maxima = 2400.0
         self.en_suelo = False
         self.atravesando_plataformas = False
-        self.tiempo_atravesar_restante = 0.0
+        self._temporizador_atravesar: Temporizador | None = None
         self.gestor_sonido = gestor_sonido
         self.clave_sonido_movimiento = f"movimiento_extensor_{Extensor._contador_sonido}"
         Extensor._contador_sonido += 1
         self.sonido_movimiento_activo = False
         if self.gestor_sonido:
-            self.gestor_sonido.registrar_efecto(self.clave_sonido_movimiento, RUTA_SONIDO_EXTENSOR, volumen=0.2)
+            self.gestor_sonido.registrar_efecto(
+                self.clave_sonido_movimiento, RUTA_SONIDO_EXTENSOR, volumen=0.2, categoria="extensor"
+            )
 
     def update(self, dt: float = 0.0, grupo_plataformas: pygame.sprite.Group | None = None, recta_limite: pygame.Rect | None = None) -> None:
         self.velocidad.x = 0.0
@@ -64,12 +71,6 @@ class Extensor(SpriteConMascara):
                         self.iniciar_caida_vertical()
                     self.objetivo_jugador = None
 
-        # Temporizador de atravesar plataformas
-        if self.atravesando_plataformas:
-            self.tiempo_atravesar_restante -= dt
-            if self.tiempo_atravesar_restante <= 0.0:
-                self.atravesando_plataformas = False
-
         self.velocidad.y += self.gravedad * dt
         if self.velocidad.y > self.velocidad_caida_maxima:
             self.velocidad.y = self.velocidad_caida_maxima
@@ -96,29 +97,33 @@ class Extensor(SpriteConMascara):
 
     def _resolver_colision_plataformas(self, grupo_plataformas: pygame.sprite.Group, posicion_previa: pygame.math.Vector2) -> None:
         hitbox = self.obtener_recta_mascara()
-        for plataforma in grupo_plataformas:
-            if not hasattr(plataforma, 'obtener_recta_mascara') or not hasattr(plataforma, 'obtener_mascara'):
-                continue
-            hitbox_plataforma = plataforma.obtener_recta_mascara()
-            if not hitbox.colliderect(hitbox_plataforma):
-                continue
-            mascara_plat = plataforma.obtener_mascara()
-            desplazamiento = (plataforma.rect.left - self.rect.left, plataforma.rect.top - self.rect.top)
-            if not self.mascara.overlap(mascara_plat, desplazamiento):
-                continue
-            hitbox_previa = pygame.Rect(
-                round(posicion_previa.x) + (hitbox.left - self.rect.left),
-                round(posicion_previa.y) + (hitbox.top - self.rect.top),
-                hitbox.width,
-                hitbox.height
-            )
-            if hitbox_previa.bottom <= hitbox_plataforma.top:
-                diferencia = hitbox.bottom - hitbox_plataforma.top
-                self.rect.bottom -= diferencia
-                self.posicion.y = float(self.rect.y)
-                self.velocidad.y = 0.0
-                self.en_suelo = True
-                break
+        hitbox_previa = hitbox.move(round(posicion_previa.x) - self.rect.left, round(posicion_previa.y) - self.rect.top)
+        pies_izquierda, pies_derecha, _ = self.obtener_linea_pies()
+        for plataforma in sprites_cercanos(grupo_plataformas, hitbox.union(hitbox_previa)):
+            repisas = plataforma.obtener_repisas() if hasattr(plataforma, 'obtener_repisas') else []
+            if repisas:
+                y_repisa = altura_aterrizaje(repisas, pies_izquierda, pies_derecha, hitbox_previa.bottom, hitbox.bottom)
+                if y_repisa is None:
+                    continue
+            else:
+                if not hasattr(plataforma, 'obtener_recta_mascara') or not hasattr(plataforma, 'obtener_mascara'):
+                    continue
+                hitbox_plataforma = plataforma.obtener_recta_mascara()
+                if not hitbox.colliderect(hitbox_plataforma):
+                    continue
+                mascara_plat = plataforma.obtener_mascara()
+                desplazamiento = (plataforma.rect.left - self.rect.left, plataforma.rect.top - self.rect.top)
+                if not self.mascara.overlap(mascara_plat, desplazamiento):
+                    continue
+                if hitbox_previa.bottom > hitbox_plataforma.top:
+                    continue
+                y_repisa = hitbox_plataforma.top
+            diferencia = hitbox.bottom - y_repisa
+            self.rect.bottom -= diferencia
+            self.posicion.y = float(self.rect.y)
+            self.velocidad.y = 0.0
+            self.en_suelo = True
+            break
 
     def _aplicar_limites(self, recta_limite: pygame.Rect) -> None:
         hitbox = self.obtener_recta_mascara()
@@ -147,7 +152,6 @@ class Extensor(SpriteConMascara):
         self._actualizar_imagen()
         self.rect = self.image.get_rect(midbottom=posicion_actual)
         self.posicion.update(self.rect.topleft)
-        self.mascara = pygame.mask.from_surface(self.image)
 
     def ordenar_ir_a_jugador(self, jugador: pygame.sprite.Sprite) -> None:
         # Si ya está alineado en X con el jugador, verificar si debe caer
@@ -164,32 +168,29 @@ class Extensor(SpriteConMascara):
     def iniciar_caida_vertical(self) -> None:
         """Activa el modo de atravesar plataformas temporalmente para dejarse caer."""
         self.atravesando_plataformas = True
-        self.tiempo_atravesar_restante = 0.25
+        self._temporizador_atravesar = planificador.reprogramar(self._temporizador_atravesar, 0.25, self._terminar_atravesar)
         # Asegurar velocidad hacia abajo para despegarse de la superficie
         if self.velocidad.y < 120.0:
             self.velocidad.y = 120.0
         self.en_suelo = False
 
-    def _escalar_fotograma(self, fotograma: pygame.Surface) -> pygame.Surface:
-        return pygame.transform.scale(fotograma, (TAMANO_EXTENSOR, TAMANO_EXTENSOR))
-
     def _actualizar_imagen(self) -> None:
-        fotograma = self.animador.obtener_fotograma_actual()
-        imagen: pygame.Surface = self._escalar_fotograma(fotograma)
-        if self.direccion < 0:
-            imagen = pygame.transform.flip(imagen, True, False)
-        self.image = imagen
-        self.mascara = pygame.mask.from_surface(self.image)
+        fotograma = self.animador.obtener_fotograma_preparado((TAMANO_EXTENSOR, TAMANO_EXTENSOR), self.direccion < 0)
+        self.image = fotograma.imagen
+        self.establecer_perfil(fotograma.perfil)
 
     def _actualizar_sonido_movimiento(self) -> None:
         if not self.gestor_sonido:
             return
         en_movimiento = self.moviendo and abs(self.velocidad.x) > 1e-2
         if en_movimiento:
-            if not self.sonido_movimiento_activo:
-                canal = self.gestor_sonido.reproducir_efecto(self.clave_sonido_movimiento, loops=-1, reiniciar=True)
-                if canal:
-                    self.sonido_movimiento_activo = True
+            canal = self.gestor_sonido.reproducir_efecto(
+                self.clave_sonido_movimiento,
+                loops=-1,
+                reiniciar=not self.sonido_movimiento_activo,
+                posicion=self.rect.center,
+            )
+            self.sonido_movimiento_activo = canal is not None
         else:
             self._detener_sonido_movimiento()
 
@@ -200,6 +201,13 @@ class Extensor(SpriteConMascara):
         self.gestor_sonido.detener_efecto(self.clave_sonido_movimiento)
         self.sonido_movimiento_activo = False
 
+    def _terminar_atravesar(self) -> None:
+        self._temporizador_atravesar = None
+        self.atravesando_plataformas = False
+
     def kill(self) -> None:
+        if self._temporizador_atravesar is not None:
+            self._temporizador_atravesar.cancelar()
+            self._temporizador_atravesar = None
         self._detener_sonido_movimiento()
         super().kill()
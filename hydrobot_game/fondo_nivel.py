@@ -0,0 +1,69 @@
+import pygame
+
+from configuracion import RUTA_FONDO_MOSAICO
+
+ESCALA_FONDO = 10
+
+
+def cargar_imagen_fondo() -> pygame.Surface | None:
+    try:
+        imagen_fondo_base = pygame.image.load(RUTA_FONDO_MOSAICO).convert()
+        ancho_original = imagen_fondo_base.get_width()
+        alto_original = imagen_fondo_base.get_height()
+        nuevo_ancho = int(ancho_original * ESCALA_FONDO)
+        nuevo_alto = int(alto_original * ESCALA_FONDO)
+        return pygame.transform.scale(imagen_fondo_base, (nuevo_ancho, nuevo_alto))
+    except pygame.error:
+        return None
+
+
+class FondoNivel:
+    """Mosaico del fondo dibujado directamente desde la baldosa, solo sobre lo que cubre la vista.
+
+    El mosaico se comporta como si cubriera todo el mundo desde (0, 0) y la camara
+    se limita a ese area, pero en memoria solo existe la baldosa.
+    """
+
+    def __init__(
+        self,
+        baldosa: pygame.Surface,
+        recta_pantalla: pygame.Rect,
+        limites_movimiento: pygame.Rect | None,
+        altura_mundo: int,
+    ) -> None:
+        self.baldosa = baldosa
+        self.ancho_vista = recta_pantalla.width
+        self.alto_vista = recta_pantalla.height
+        self.ancho = max(recta_pantalla.width, int(limites_movimiento.right)) if limites_movimiento else recta_pantalla.width
+        self.alto = max(recta_pantalla.height, altura_mundo)
+
+    def origen_vista(self, desplazamiento_camara: pygame.math.Vector2) -> tuple[int, int]:
+        x_inicio = max(0, min(int(desplazamiento_camara.x), self.ancho - self.ancho_vista))
+        y_inicio = max(0, min(int(desplazamiento_camara.y), self.alto - self.alto_vista))
+        return x_inicio, y_inicio
+
+    def dibujar(self, pantalla: pygame.Surface, desplazamiento_camara: pygame.math.Vector2) -> None:
+        ancho_baldosa = self.baldosa.get_width()
+        alto_baldosa = self.baldosa.get_height()
+        if ancho_baldosa <= 0 or alto_baldosa <= 0:
+            return
+        x_inicio, y_inicio = self.origen_vista(desplazamiento_camara)
+        ancho_vista = min(self.ancho_vista, self.ancho)
+        alto_vista = min(self.alto_vista, self.alto)
+        destinos = [
+            (self.baldosa, (x, y))
+            for y in range(-(y_inicio % alto_baldosa), alto_vista, alto_baldosa)
+            for x in range(-(x_inicio % ancho_baldosa), ancho_vista, ancho_baldosa)
+        ]
+        pantalla.blits(destinos, doreturn=False)
+
+
+def crear_fondo_nivel(
+    imagen_fondo_base: pygame.Surface | None,
+    recta_pantalla: pygame.Rect,
+    limites_movimiento: pygame.Rect | None,
+    altura_mundo: int,
+) -> FondoNivel | None:
+    if not imagen_fondo_base or altura_mundo <= 0:
+        return None
+    return FondoNivel(imagen_fondo_base, recta_pantalla, limites_movimiento, altura_mundo)
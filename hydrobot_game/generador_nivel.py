@@ -1,13 +1,100 @@
+import numpy as np
 import pygame
 import random
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
+from cache_niveles import calcular_hash_mapa, cargar_nivel_compilado, guardar_nivel_compilado
+from indice_espacial import GrupoEspacial
 from plataforma import Plataforma
 from tuberia import Tuberia
 from rutas import ruta_recurso
 
 if TYPE_CHECKING:
     from gestor_sonido import GestorSonido
+    from particula import SistemaParticulas
+
+
+COLOR_PLATAFORMA = (0, 0, 0)
+COLOR_TUBERIA_NORMAL = (0, 255, 0)
+COLOR_TUBERIA_DANABLE = (255, 0, 0)
+COLOR_TUBERIA_AZUL = (0, 0, 255)
+COLOR_TUBERIA_TUTORIAL = (255, 255, 0)
+COLOR_META_TUTORIAL = (0, 255, 255)
+COLOR_VACIO = (255, 255, 255)
+
+TIPO_VACIO = 0
+TIPO_PLATAFORMA = 1
+TIPO_TUBERIA_NORMAL = 2
+TIPO_TUBERIA_DANABLE = 3
+TIPO_TUBERIA_AZUL = 4
+TIPO_TUBERIA_TUTORIAL = 5
+TIPO_META_TUTORIAL = 6
+
+_TIPOS_POR_COLOR: dict[tuple[int, int, int], int] = {
+    COLOR_PLATAFORMA: TIPO_PLATAFORMA,
+    COLOR_TUBERIA_NORMAL: TIPO_TUBERIA_NORMAL,
+    COLOR_TUBERIA_DANABLE: TIPO_TUBERIA_DANABLE,
+    COLOR_TUBERIA_AZUL: TIPO_TUBERIA_AZUL,
+    COLOR_TUBERIA_TUTORIAL: TIPO_TUBERIA_TUTORIAL,
+    COLOR_META_TUTORIAL: TIPO_META_TUTORIAL,
+}
+
+VARIANTE_H = 0
+VARIANTE_H1 = 1
+VARIANTE_H_MENOS_1 = 2
+
+RUTA_TUBERIA_H = ruta_recurso("texturas", "obj_ecn", "tuberia_h.png")
+RUTAS_VARIANTE_TUBERIA = {
+    VARIANTE_H: RUTA_TUBERIA_H,
+    VARIANTE_H1: ruta_recurso("texturas", "obj_ecn", "tuberia_h1.png"),
+    VARIANTE_H_MENOS_1: ruta_recurso("texturas", "obj_ecn", "tuberia_h-1.png"),
+}
+
+
+def _codigo_color(color: tuple[int, int, int]) -> int:
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def clasificar_mapa(imagen_mapa: pygame.Surface) -> tuple[np.ndarray, np.ndarray]:
+    """Clasifica todos los pixeles del mapa de una vez.
+
+    Devuelve dos arreglos (alto, ancho): el tipo de tile de cada celda y la
+    variante de tuberia azul segun sus vecinas horizontales.
+    """
+    pixeles = pygame.surfarray.array3d(imagen_mapa).astype(np.int32)
+    codigos = ((pixeles[:, :, 0] << 16) | (pixeles[:, :, 1] << 8) | pixeles[:, :, 2]).T
+    tipos = np.full(codigos.shape, TIPO_VACIO, dtype=np.uint8)
+    for color, tipo in _TIPOS_POR_COLOR.items():
+        tipos[codigos == _codigo_color(color)] = tipo
+
+    conecta = (tipos == TIPO_TUBERIA_NORMAL) | (tipos == TIPO_TUBERIA_DANABLE)
+    conexion_izquierda = np.zeros_like(conecta)
+    conexion_izquierda[:, 1:] = conecta[:, :-1]
+    conexion_derecha = np.zeros_like(conecta)
+    conexion_derecha[:, :-1] = conecta[:, 1:]
+    azul = tipos == TIPO_TUBERIA_AZUL
+    variantes = np.full(tipos.shape, VARIANTE_H, dtype=np.uint8)
+    variantes[azul & conexion_izquierda] = VARIANTE_H1
+    variantes[azul & conexion_derecha] = VARIANTE_H_MENOS_1
+    return tipos, variantes
+
+
+def obtener_clasificacion_mapa(ruta_imagen: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """Clasifica el mapa reutilizando la version compilada en disco si el PNG no ha cambiado."""
+    hash_mapa = calcular_hash_mapa(ruta_imagen)
+    if hash_mapa is not None:
+        compilado = cargar_nivel_compilado(hash_mapa)
+        if compilado is not None:
+            return compilado
+    try:
+        # Sin convert(): clasificar_mapa no depende del formato y asi se puede llamar desde un hilo.
+        imagen_mapa = pygame.image.load(ruta_imagen)
+    except pygame.error:
+        return None
+    tipos, variantes = clasificar_mapa(imagen_mapa)
+    if hash_mapa is not None:
+        guardar_nivel_compilado(hash_mapa, tipos, variantes)
+    return tipos, variantes
 
 
 def generar_nivel_desde_imagen(
@@ -17,80 +104,50 @@ def generar_nivel_desde_imagen(
     minimo_rotas: int = 0,
     prob_rotura: float = 0.1,
     gestor_sonido: Optional["GestorSonido"] = None,
+    sistema_particulas: Optional["SistemaParticulas"] = None,
 ) -> tuple[pygame.sprite.Group, pygame.sprite.Group, int, int, int, dict[str, object]]:
-    grupo_plataformas = pygame.sprite.Group()
-    grupo_tuberias = pygame.sprite.Group()
+    grupo_plataformas = GrupoEspacial(tamano_celda=tamano_tile * 2)
+    grupo_tuberias = GrupoEspacial(tamano_celda=tamano_tile * 2)
     tuberias_verticales: list[Tuberia] = []
     datos_extra: dict[str, object] = {"recta_meta": None, "tuberias_verticales": tuberias_verticales}
     nombre_mapa = Path(ruta_imagen).name.lower()
     es_tutorial = "mapeadot" in nombre_mapa or "tutorial" in nombre_mapa
     
-    try:
-        imagen_mapa = pygame.image.load(ruta_imagen).convert()
-    except pygame.error:
+    clasificacion = obtener_clasificacion_mapa(ruta_imagen)
+    if clasificacion is None:
         return grupo_plataformas, grupo_tuberias, 0, 0, 0, datos_extra
     
-    ancho_mapa = imagen_mapa.get_width()
-    alto_mapa = imagen_mapa.get_height()
+    tipos, variantes = clasificacion
+    alto_mapa, ancho_mapa = tipos.shape
     
     ancho_mundo = ancho_mapa * tamano_tile
     desplazamiento_x = (ancho_pantalla - ancho_mundo) // 2
     if desplazamiento_x < 0:
         desplazamiento_x = 0
     
-    COLOR_PLATAFORMA = (0, 0, 0)
-    COLOR_TUBERIA_NORMAL = (0, 255, 0)
-    COLOR_TUBERIA_DANABLE = (255, 0, 0)
-    COLOR_TUBERIA_AZUL = (0, 0, 255)
-    COLOR_TUBERIA_TUTORIAL = (255, 255, 0)
-    COLOR_META_TUTORIAL = (0, 255, 255)
-    COLOR_VACIO = (255, 255, 255)
-
-    ruta_tuberia_h = ruta_recurso("texturas", "obj_ecn", "tuberia_h.png")
-    ruta_tuberia_h1 = ruta_recurso("texturas", "obj_ecn", "tuberia_h1.png")
-    ruta_tuberia_h_1 = ruta_recurso("texturas", "obj_ecn", "tuberia_h-1.png")
-    
-    for y in range(alto_mapa):
-        for x in range(ancho_mapa):
-            color = imagen_mapa.get_at((x, y))[:3]
-            
-            if color == COLOR_VACIO:
-                continue
-            
-            posicion = (x * tamano_tile + desplazamiento_x, y * tamano_tile)
-            
-            if color == COLOR_PLATAFORMA:
-                Plataforma(posicion, grupo_plataformas)
-            elif color == COLOR_TUBERIA_NORMAL:
-                Tuberia(posicion, False, gestor_sonido, grupo_tuberias, ruta_imagen=ruta_tuberia_h)
-            elif color == COLOR_TUBERIA_DANABLE:
-                danada = True if es_tutorial else random.random() < prob_rotura
-                Tuberia(posicion, danada, gestor_sonido, grupo_tuberias, ruta_imagen=ruta_tuberia_h)
-            elif color == COLOR_TUBERIA_AZUL:
-                colores_conexion = (COLOR_TUBERIA_DANABLE, COLOR_TUBERIA_NORMAL)
-                conexion_izquierda = False
-                conexion_derecha = False
-                if x - 1 >= 0:
-                    color_izq = imagen_mapa.get_at((x - 1, y))[:3]
-                    conexion_izquierda = color_izq in colores_conexion
-                if x + 1 < ancho_mapa:
-                    color_der = imagen_mapa.get_at((x + 1, y))[:3]
-                    conexion_derecha = color_der in colores_conexion
-                ruta_elegida = ruta_tuberia_h
-                if conexion_derecha:
-                    ruta_elegida = ruta_tuberia_h_1
-                elif conexion_izquierda:
-                    ruta_elegida = ruta_tuberia_h1
-                danada = random.random() < prob_rotura
-                Tuberia(posicion, danada, gestor_sonido, grupo_tuberias, ruta_imagen=ruta_elegida)
-            elif color == COLOR_TUBERIA_TUTORIAL:
-                tuberia_tutorial = Tuberia(posicion, False, gestor_sonido, grupo_tuberias, ruta_imagen=ruta_tuberia_h)
-                setattr(tuberia_tutorial, "orientacion", "vertical")
-                setattr(tuberia_tutorial, "requiere_caida", True)
-                setattr(tuberia_tutorial, "es_tutorial", True)
-                tuberias_verticales.append(tuberia_tutorial)
-            elif color == COLOR_META_TUTORIAL:
-                datos_extra["recta_meta"] = pygame.Rect(posicion[0], posicion[1], tamano_tile, tamano_tile)
+    for y, x in np.argwhere(tipos != TIPO_VACIO).tolist():
+        tipo = int(tipos[y, x])
+        posicion = (x * tamano_tile + desplazamiento_x, y * tamano_tile)
+        
+        if tipo == TIPO_PLATAFORMA:
+            Plataforma(posicion, grupo_plataformas)
+        elif tipo == TIPO_TUBERIA_NORMAL:
+            Tuberia(posicion, False, gestor_sonido, grupo_tuberias, ruta_imagen=RUTA_TUBERIA_H, sistema_particulas=sistema_particulas)
+        elif tipo == TIPO_TUBERIA_DANABLE:
+            danada = True if es_tutorial else random.random() < prob_rotura
+            Tuberia(posicion, danada, gestor_sonido, grupo_tuberias, ruta_imagen=RUTA_TUBERIA_H, sistema_particulas=sistema_particulas)
+        elif tipo == TIPO_TUBERIA_AZUL:
+            ruta_elegida = RUTAS_VARIANTE_TUBERIA[int(variantes[y, x])]
+            danada = random.random() < prob_rotura
+            Tuberia(posicion, danada, gestor_sonido, grupo_tuberias, ruta_imagen=ruta_elegida, sistema_particulas=sistema_particulas)
+        elif tipo == TIPO_TUBERIA_TUTORIAL:
+            tuberia_tutorial = Tuberia(posicion, False, gestor_sonido, grupo_tuberias, ruta_imagen=RUTA_TUBERIA_H, sistema_particulas=sistema_particulas)
+            setattr(tuberia_tutorial, "orientacion", "vertical")
+            setattr(tuberia_tutorial, "requiere_caida", True)
+            setattr(tuberia_tutorial, "es_tutorial", True)
+            tuberias_verticales.append(tuberia_tutorial)
+        elif tipo == TIPO_META_TUTORIAL:
+            datos_extra["recta_meta"] = pygame.Rect(posicion[0], posicion[1], tamano_tile, tamano_tile)
     
     altura_mundo = alto_mapa * tamano_tile
     if minimo_rotas > 0:
@@ -101,5 +158,5 @@ def generar_nivel_desde_imagen(
             candidatas = [t for t in tuberias_lista if not getattr(t, "danada", False)]
             random.shuffle(candidatas)
             for t in candidatas[:faltan]:
-                setattr(t, "danada", True)
+                t.marcar_danada()
     return grupo_plataformas, grupo_tuberias, altura_mundo, desplazamiento_x, ancho_mundo, datos_extra
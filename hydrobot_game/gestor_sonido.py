@@ -1,29 +1,53 @@
 import pygame
-from typing import Optional
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from voces import CATEGORIA_POR_DEFECTO, GestorVoces
+
+LIMITE_BYTES_SONIDOS = 48 * 1024 * 1024
+TOTAL_CANALES = 32
+CANALES_RESERVADOS = 4
+
+
+def _bytes_sonido(sonido: pygame.mixer.Sound) -> int:
+    formato = pygame.mixer.get_init()
+    if not formato:
+        return 0
+    frecuencia, tamano, canales = formato
+    return int(round(sonido.get_length() * frecuencia)) * canales * (abs(tamano) // 8)
 
 
 class GestorSonido:
-    def __init__(self, ruta_musica_menu: str) -> None:
+    """Musica y efectos. Los efectos decodificados se guardan por ruta en una cache LRU limitada en bytes.
+
+    Los efectos con canal fijo usan los canales reservados; el resto pide voz a
+    `self.voces`, que reparte los canales libres por categoria y distancia al oyente.
+    """
+
+    def __init__(self, ruta_musica_menu: str, limite_bytes_sonidos: int = LIMITE_BYTES_SONIDOS) -> None:
         self.ruta_musica_menu = ruta_musica_menu
         self.ruta_musica_actual: str | None = None
         self.volumen_musica = 0.4
         self.volumen_efectos = 0.6
         self.musica_habilitada = True
         self.musica_sonando = False
-        self._efectos: dict[str, pygame.mixer.Sound] = {}
-        self._efectos_puntuales: dict[str, pygame.mixer.Sound] = {}
+        self._sonidos: OrderedDict[str, pygame.mixer.Sound] = OrderedDict()
+        self._bytes_por_sonido: dict[str, int] = {}
+        self.bytes_decodificados = 0
+        self.limite_bytes_sonidos = limite_bytes_sonidos
         self._config_efectos: dict[str, dict[str, Optional[float | int | str]]] = {}
         self._canales_reservados: dict[str, Optional[pygame.mixer.Channel]] = {}
-        self._canales_activos: dict[str, Optional[pygame.mixer.Channel]] = {}
+        self._contador_puntuales = 0
         self._inicializar_mixer()
+        self.voces = GestorVoces(CANALES_RESERVADOS, TOTAL_CANALES)
 
     def _inicializar_mixer(self) -> None:
         try:
             if not pygame.mixer.get_init():
                 pygame.mixer.init()
-            pygame.mixer.set_num_channels(32)
+            pygame.mixer.set_num_channels(TOTAL_CANALES)
             try:
-                pygame.mixer.set_reserved(4)
+                pygame.mixer.set_reserved(CANALES_RESERVADOS)
             except pygame.error:
                 pass
         except pygame.error as error:
@@ -98,10 +122,16 @@ class GestorSonido:
     def obtener_estado_musica(self) -> str:
         return "SI" if self.musica_habilitada else "NO"
 
-    def registrar_efecto(self, clave: str, ruta: str, canal: int | None = None, volumen: float = 1.0) -> None:
+    def registrar_efecto(
+        self,
+        clave: str,
+        ruta: str,
+        canal: int | None = None,
+        volumen: float = 1.0,
+        categoria: str = CATEGORIA_POR_DEFECTO,
+    ) -> None:
         volumen_clamp = max(0.0, min(1.0, volumen))
-        self._config_efectos[clave] = {"ruta": ruta, "canal": canal, "volumen": volumen_clamp}
-        self._efectos.pop(clave, None)
+        self._config_efectos[clave] = {"ruta": ruta, "canal": canal, "volumen": volumen_clamp, "categoria": categoria}
         if canal is not None:
             try:
                 self._canales_reservados[clave] = pygame.mixer.Channel(canal)
@@ -113,28 +143,54 @@ class GestorSonido:
             self.registrar_efecto(clave, ruta)
             return
         self._config_efectos[clave]["ruta"] = ruta
-        self._efectos.pop(clave, None)
 
     def actualizar_volumen_efecto(self, clave: str, volumen: float) -> None:
         if clave not in self._config_efectos:
             return
         self._config_efectos[clave]["volumen"] = max(0.0, min(1.0, volumen))
 
+    def _cargar_sonido(self, ruta: str) -> Optional[pygame.mixer.Sound]:
+        sonido = self._sonidos.get(ruta)
+        if sonido is not None:
+            self._sonidos.move_to_end(ruta)
+            return sonido
+        try:
+            sonido = pygame.mixer.Sound(ruta)
+        except (pygame.error, FileNotFoundError) as error:
+            print(f"Error al cargar efecto {ruta}: {error}")
+            return None
+        tamano = _bytes_sonido(sonido)
+        self._sonidos[ruta] = sonido
+        self._bytes_por_sonido[ruta] = tamano
+        self.bytes_decodificados += tamano
+        # Los canales que lo esten reproduciendo conservan su referencia aunque se expulse.
+        while self.bytes_decodificados > self.limite_bytes_sonidos and len(self._sonidos) > 1:
+            ruta_expulsada, _ = self._sonidos.popitem(last=False)
+            self.bytes_decodificados -= self._bytes_por_sonido.pop(ruta_expulsada, 0)
+        return sonido
+
     def _obtener_sonido(self, clave: str) -> Optional[pygame.mixer.Sound]:
         if clave not in self._config_efectos:
             return None
-        if clave not in self._efectos:
-            ruta = self._config_efectos[clave].get("ruta")
-            if not ruta:
-                return None
-            try:
-                self._efectos[clave] = pygame.mixer.Sound(str(ruta))
-            except pygame.error as error:
-                print(f"Error al cargar efecto {ruta}: {error}")
-                return None
-        return self._efectos.get(clave)
+        ruta = self._config_efectos[clave].get("ruta")
+        if not ruta:
+            return None
+        return self._cargar_sonido(str(ruta))
+
+    def precargar(self, rutas_extra: Iterable[str] = ()) -> int:
+        """Decodifica ya todos los efectos registrados y `rutas_extra`; devuelve cuantos hay en memoria."""
+        rutas = {str(config["ruta"]) for config in self._config_efectos.values() if config.get("ruta")}
+        rutas.update(rutas_extra)
+        for ruta in sorted(rutas):
+            self._cargar_sonido(ruta)
+        return len(self._sonidos)
 
-    def _obtener_canal(self, clave: str, canal_forzado: int | None = None) -> Optional[pygame.mixer.Channel]:
+    def vaciar_cache_sonidos(self) -> None:
+        self._sonidos.clear()
+        self._bytes_por_sonido.clear()
+        self.bytes_decodificados = 0
+
+    def _obtener_canal_reservado(self, clave: str, canal_forzado: int | None = None) -> Optional[pygame.mixer.Channel]:
         if clave in self._canales_reservados and self._canales_reservados[clave] is not None:
             return self._canales_reservados[clave]
         canal_config = self._config_efectos.get(clave, {}).get("canal")
@@ -146,7 +202,7 @@ class GestorSonido:
                 return canal
             except pygame.error:
                 pass
-        return pygame.mixer.find_channel()
+        return None
 
     def _aplicar_volumen(self, clave: str, volumen: float | None) -> float:
         base_config = self._config_efectos.get(clave, {}).get("volumen") if clave in self._config_efectos else 1.0
@@ -167,59 +223,108 @@ class GestorSonido:
         reiniciar: bool = False,
         ruta: str | None = None,
         canal: int | None = None,
+        categoria: str | None = None,
+        posicion: tuple[float, float] | None = None,
+        clave_voz: str | None = None,
     ) -> Optional[pygame.mixer.Channel]:
+        """Reproduce `clave`; con `posicion` (coordenadas de mundo) se atenua segun la distancia al oyente.
+
+        `clave_voz` permite que varias instancias compartan la configuracion de `clave`
+        y pidan cada una su propia voz. Devuelve None si no hay sonido o si el gestor
+        de voces no le da canal.
+        """
         if clave not in self._config_efectos:
             if ruta is None:
                 return None
-            self.registrar_efecto(clave, ruta, canal=canal, volumen=volumen if volumen is not None else 1.0)
+            self.registrar_efecto(
+                clave,
+                ruta,
+                canal=canal,
+                volumen=volumen if volumen is not None else 1.0,
+                categoria=categoria or CATEGORIA_POR_DEFECTO,
+            )
         elif ruta is not None:
             if self._config_efectos[clave].get("ruta") != ruta:
                 self.actualizar_ruta_efecto(clave, ruta)
         sonido = self._obtener_sonido(clave)
         if sonido is None:
             return None
-        canal_audio = self._obtener_canal(clave, canal)
+        volumen_final = self._aplicar_volumen(clave, volumen)
+        clave_voz = clave_voz or clave
+        canal_audio = self._obtener_canal_reservado(clave, canal)
         if canal_audio is None:
-            return None
-        if not reiniciar and canal_audio.get_busy():
-            self._canales_activos[clave] = canal_audio
+            categoria_voz = categoria or str(self._config_efectos[clave].get("categoria") or CATEGORIA_POR_DEFECTO)
+            ya_sonaba = self.voces.voz_activa(clave_voz) is not None
+            canal_audio = self.voces.asignar(clave_voz, categoria_voz, posicion, volumen_final)
+            if canal_audio is None:
+                return None
+            if ya_sonaba and not reiniciar:
+                return canal_audio
+            volumen_final = self.voces.volumen_canal(clave_voz)
+        elif not reiniciar and canal_audio.get_busy():
             return canal_audio
-        volumen_final = self._aplicar_volumen(clave, volumen)
         canal_audio.set_volume(volumen_final)
         canal_audio.play(sonido, loops=loops)
-        self._canales_activos[clave] = canal_audio
         return canal_audio
 
-    def detener_efecto(self, clave: str) -> None:
-        canal = self._canales_activos.get(clave) or self._canales_reservados.get(clave)
+    def establecer_oyente(self, posicion: tuple[float, float] | None) -> None:
+        self.voces.establecer_oyente(posicion)
+
+    def actualizar_voces(self) -> None:
+        self.voces.actualizar()
+
+    def _canal_de(self, clave: str, clave_voz: str | None = None) -> Optional[pygame.mixer.Channel]:
+        canal = self._canales_reservados.get(clave)
+        if canal is not None:
+            return canal
+        clave_voz = clave_voz or clave
+        voz = self.voces.voz_activa(clave_voz)
+        if voz is None:
+            # Sin voz el canal pudo pasar a otro efecto; no se toca.
+            return None
+        return voz.canal
+
+    def detener_efecto(self, clave: str, clave_voz: str | None = None) -> None:
+        clave_voz = clave_voz or clave
+        canal = self._canal_de(clave, clave_voz)
         if canal and canal.get_busy():
             canal.stop()
-        self._canales_activos.pop(clave, None)
+        self.voces.liberar(clave_voz)
 
-    def esta_reproduciendo(self, clave: str) -> bool:
-        canal = self._canales_activos.get(clave) or self._canales_reservados.get(clave)
+    def esta_reproduciendo(self, clave: str, clave_voz: str | None = None) -> bool:
+        canal = self._canal_de(clave, clave_voz)
         return bool(canal and canal.get_busy())
 
-    def reproducir_efecto_puntual(self, ruta: str, volumen: float | None = None) -> Optional[pygame.mixer.Channel]:
-        if ruta not in self._efectos_puntuales:
-            try:
-                self._efectos_puntuales[ruta] = pygame.mixer.Sound(ruta)
-            except pygame.error as error:
-                print(f"Error al cargar efecto puntual {ruta}: {error}")
-                return None
-        canal = pygame.mixer.find_channel()
-        if canal is None:
+    def reproducir_efecto_puntual(
+        self,
+        ruta: str,
+        volumen: float | None = None,
+        categoria: str = CATEGORIA_POR_DEFECTO,
+        posicion: tuple[float, float] | None = None,
+    ) -> Optional[pygame.mixer.Channel]:
+        sonido = self._cargar_sonido(ruta)
+        if sonido is None:
             return None
         volumen_final = max(0.0, min(1.0, (volumen if volumen is not None else 1.0) * self.volumen_efectos))
-        canal.set_volume(volumen_final)
-        canal.play(self._efectos_puntuales[ruta])
+        self._contador_puntuales += 1
+        clave = f"puntual_{self._contador_puntuales}"
+        canal = self.voces.asignar(clave, categoria, posicion, volumen_final)
+        if canal is None:
+            return None
+        canal.set_volume(self.voces.volumen_canal(clave))
+        canal.play(sonido)
         return canal
 
     def limpiar(self) -> None:
         try:
-            for clave in list(self._canales_activos.keys()):
-                self.detener_efecto(clave)
+            for clave in list(self.voces.voces.keys()):
+                self.voces.liberar(clave)
+            for canal in self._canales_reservados.values():
+                if canal is not None:
+                    canal.stop()
             pygame.mixer.music.stop()
             pygame.mixer.quit()
         except pygame.error as error:
             print(f"Error al limpiar mixer: {error}")
+        # Sin mixer los sonidos decodificados ya no sirven.
+        self.vaciar_cache_sonidos()
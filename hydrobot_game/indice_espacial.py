@@ -0,0 +1,120 @@
+import pygame
+from typing import Callable, Iterable
+
+_TAMANO_CELDA = 200
+
+
+class GrupoEspacial(pygame.sprite.Group):
+    """Grupo de sprites estaticos indexado en una rejilla uniforme para consultas por area."""
+
+    def __init__(self, *sprites: pygame.sprite.Sprite, tamano_celda: int = _TAMANO_CELDA) -> None:
+        self.tamano_celda = max(1, tamano_celda)
+        self._celdas: dict[tuple[int, int], list[pygame.sprite.Sprite]] = {}
+        self._rectas_indexadas: dict[pygame.sprite.Sprite, pygame.Rect] = {}
+        self._orden: dict[pygame.sprite.Sprite, int] = {}
+        self._pendientes: list[pygame.sprite.Sprite] = []
+        self._siguiente_orden = 0
+        self.observadores: list[Callable[[pygame.sprite.Sprite, pygame.Rect | None], None]] = []
+        super().__init__(*sprites)
+
+    def _rango_celdas(self, recta: pygame.Rect) -> tuple[range, range]:
+        tamano = self.tamano_celda
+        columnas = range(recta.left // tamano, (recta.right - 1) // tamano + 1)
+        filas = range(recta.top // tamano, (recta.bottom - 1) // tamano + 1)
+        return columnas, filas
+
+    def _indexar(self, sprite: pygame.sprite.Sprite) -> None:
+        recta = getattr(sprite, "rect", None)
+        if recta is None:
+            # Los sprites se anaden al grupo antes de tener recta; se indexan en la siguiente consulta.
+            self._pendientes.append(sprite)
+            return
+        recta = pygame.Rect(recta)
+        columnas, filas = self._rango_celdas(recta)
+        for columna in columnas:
+            for fila in filas:
+                self._celdas.setdefault((columna, fila), []).append(sprite)
+        self._rectas_indexadas[sprite] = recta
+
+    def _indexar_pendientes(self) -> None:
+        pendientes = [sprite for sprite in self._pendientes if sprite in self._orden]
+        self._pendientes = []
+        for sprite in pendientes:
+            self._indexar(sprite)
+
+    def _desindexar(self, sprite: pygame.sprite.Sprite) -> None:
+        recta = self._rectas_indexadas.pop(sprite, None)
+        if recta is None:
+            return
+        columnas, filas = self._rango_celdas(recta)
+        for columna in columnas:
+            for fila in filas:
+                celda = self._celdas.get((columna, fila))
+                if celda is None:
+                    continue
+                try:
+                    celda.remove(sprite)
+                except ValueError:
+                    continue
+                if not celda:
+                    del self._celdas[(columna, fila)]
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer: None = None) -> None:
+        super().add_internal(sprite, layer)
+        if sprite not in self._orden:
+            self._orden[sprite] = self._siguiente_orden
+            self._siguiente_orden += 1
+            self._indexar(sprite)
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().remove_internal(sprite)
+        self._desindexar(sprite)
+        self._orden.pop(sprite, None)
+
+    def reubicar(self, sprite: pygame.sprite.Sprite) -> None:
+        """Actualiza la rejilla tras mover un sprite del grupo."""
+        if sprite not in self._orden:
+            return
+        if self._pendientes:
+            self._indexar_pendientes()
+        recta_actual = getattr(sprite, "rect", None)
+        if recta_actual is not None and self._rectas_indexadas.get(sprite) == recta_actual:
+            return
+        self._desindexar(sprite)
+        self._indexar(sprite)
+
+    def notificar_cambio(self, sprite: pygame.sprite.Sprite) -> None:
+        """Reindexa el sprite y avisa a los observadores con la recta que tenia antes."""
+        if sprite not in self._orden:
+            return
+        recta_anterior = self._rectas_indexadas.get(sprite)
+        recta_anterior = recta_anterior.copy() if recta_anterior is not None else None
+        self.reubicar(sprite)
+        for observador in self.observadores:
+            observador(sprite, recta_anterior)
+
+    def sprites_en(self, recta: pygame.Rect) -> list[pygame.sprite.Sprite]:
+        """Sprites cuya recta toca `recta`, en el mismo orden en que se anadieron al grupo."""
+        if recta.width <= 0 or recta.height <= 0:
+            return []
+        if self._pendientes:
+            self._indexar_pendientes()
+        columnas, filas = self._rango_celdas(recta)
+        encontrados: dict[pygame.sprite.Sprite, None] = {}
+        for columna in columnas:
+            for fila in filas:
+                celda = self._celdas.get((columna, fila))
+                if celda is None:
+                    continue
+                for sprite in celda:
+                    if sprite in encontrados:
+                        continue
+                    if self._rectas_indexadas[sprite].colliderect(recta):
+                        encontrados[sprite] = None
+        return sorted(encontrados, key=self._orden.__getitem__)
+
+
+def sprites_cercanos(grupo: Iterable[pygame.sprite.Sprite], recta: pygame.Rect) -> Iterable[pygame.sprite.Sprite]:
+    if isinstance(grupo, GrupoEspacial):
+        return grupo.sprites_en(recta)
+    return grupo
@@ -0,0 +1,51 @@
+import pygame
+from typing import Callable, Hashable, Sequence
+
+from boton import Boton
+
+
+class CapaInterfaz:
+    """Presenta pantallas de menu sin redibujarlas enteras cada cuadro.
+
+    La pantalla completa se dibuja y se vuelca solo cuando cambia el estado o su
+    `firma` (los textos variables, como los volumenes). El resto de cuadros solo
+    se repintan los botones cuyo resaltado cambio, restaurando el fondo guardado
+    debajo, y se envian esas rectas a `pygame.display.update`.
+    """
+
+    def __init__(self) -> None:
+        self._clave: tuple[str, Hashable] | None = None
+        self._fondo: pygame.Surface | None = None
+
+    def invalidar(self) -> None:
+        self._clave = None
+        self._fondo = None
+
+    def presentar(
+        self,
+        pantalla: pygame.Surface,
+        estado: str,
+        firma: Hashable,
+        dibujar_fondo: Callable[[], None],
+        botones: Sequence[tuple[Boton, pygame.font.Font]],
+    ) -> None:
+        clave = (estado, firma)
+        if clave != self._clave or self._fondo is None:
+            dibujar_fondo()
+            self._fondo = pantalla.copy()
+            for boton, fuente in botones:
+                boton.dibujar(pantalla, fuente)
+            self._clave = clave
+            pygame.display.flip()
+            return
+
+        posicion_raton = pygame.mouse.get_pos()
+        rectas: list[pygame.Rect] = []
+        for boton, fuente in botones:
+            if not boton.actualizar_resaltado(posicion_raton):
+                continue
+            pantalla.blit(self._fondo, boton.recta, boton.recta)
+            boton.dibujar(pantalla, fuente)
+            rectas.append(boton.recta.copy())
+        if rectas:
+            pygame.display.update(rectas)
@@ -3,12 +3,16 @@ import sys
 import pygame
 
 from boton import Boton
+from cache_texto import cache_texto, renderizar_texto
+from capa_estatica import CapaEstatica
+from cargador_escena import CargaEscena, dibujar_pantalla_carga
 from configuracion import (
     CONFIGURACION_TUTORIAL,
     CONFIGURACIONES_ESCENA,
     ConfiguracionEscena,
+    FPS_MAXIMO,
+    FPS_MENU,
     RUTA_BOTON_MENU,
-    RUTA_FONDO_MOSAICO,
     RUTA_MAPEADO_ESCENA1,
     RUTA_MAPEADO_ESCENA2,
     RUTA_MAPEADO_ESCENA3,
@@ -21,11 +25,19 @@ from configuracion import (
     RUTA_SONIDO_FELICIDADES,
     TAMANO_VENTANA,
 )
-from entorno import crear_entorno, limitar, manejar_extensor_soltado
+from entorno import actualizar_camara, crear_entorno, manejar_extensor_soltado
+from fondo_nivel import FondoNivel, cargar_imagen_fondo, crear_fondo_nivel
+from interfaz import CapaInterfaz
 from gestor_sonido import GestorSonido
 from minimapa import MiniMapa
 from npc_tutorial import NPCTutorial
+from paso_fijo import InterpoladorPosiciones, PasoFijo
+from perfilador import PerfiladorCuadro
+from particula import SistemaParticulas
 from player import Jugador
+from render_mundo import dibujar_mundo
+from temporizador import planificador
+from tuberia import RUTA_PARCHE1, RUTA_PARCHE2
 
 
 def crear_botones_menu(recta_pantalla: pygame.Rect, textura: pygame.Surface | None) -> dict[str, Boton]:
@@ -106,6 +118,24 @@ def crear_botones_opciones(recta_pantalla: pygame.Rect, textura: pygame.Surface
     return botones
 
 
+def obtener_datos_escena(etiqueta: str) -> tuple[ConfiguracionEscena, str, int] | None:
+    if etiqueta == "tutorial":
+        return CONFIGURACION_TUTORIAL, RUTA_MAPEADO_TUTORIAL, 0
+    if etiqueta not in CONFIGURACIONES_ESCENA:
+        return None
+    if etiqueta == "1":
+        ruta_mapeado = RUTA_MAPEADO_ESCENA1
+    elif etiqueta == "2":
+        ruta_mapeado = RUTA_MAPEADO_ESCENA2
+    else:
+        ruta_mapeado = RUTA_MAPEADO_ESCENA3
+    minimo_rotas = 3 if etiqueta == "1" else 0
+    return CONFIGURACIONES_ESCENA[etiqueta], ruta_mapeado, minimo_rotas
+
+
+ESTADOS_INTERFAZ = {"menu", "seleccion_escena", "opciones", "nivel_completado"}
+
+
 def ejecutar_juego() -> None:
     pygame.init()
     pygame.display.set_caption("Demostracion Hydrobot")
@@ -116,18 +146,11 @@ def ejecutar_juego() -> None:
     fuente_titulo = pygame.font.Font(None, 74)
     fuente_mediana = pygame.font.Font(None, 48)
     fuente_pequena = pygame.font.Font(None, 32)
+    fuente_perfil = pygame.font.Font(None, 22)
 
     gestor = GestorSonido(RUTA_MUSICA_MENU)
     
-    try:
-        imagen_fondo_base = pygame.image.load(RUTA_FONDO_MOSAICO).convert()
-        ancho_original = imagen_fondo_base.get_width()
-        alto_original = imagen_fondo_base.get_height()
-        nuevo_ancho = int(ancho_original * 10)
-        nuevo_alto = int(alto_original * 10)
-        imagen_fondo_base = pygame.transform.scale(imagen_fondo_base, (nuevo_ancho, nuevo_alto))
-    except pygame.error:
-        imagen_fondo_base = None
+    imagen_fondo_base = cargar_imagen_fondo()
 
     try:
         textura_boton_menu = pygame.image.load(RUTA_BOTON_MENU).convert_alpha()
@@ -142,28 +165,77 @@ def ejecutar_juego() -> None:
     grupo_extensores: pygame.sprite.Group | None = None
     grupo_plataformas: pygame.sprite.Group | None = None
     grupo_tuberias: pygame.sprite.Group | None = None
-    grupo_particulas: pygame.sprite.Group | None = None
+    sistema_particulas: SistemaParticulas | None = None
     limites_movimiento: pygame.Rect | None = None
     altura_mundo = 0
     desplazamiento_camara = pygame.math.Vector2(0, 0)
-    superficie_fondo_nivel: pygame.Surface | None = None
+    fondo_nivel: FondoNivel | None = None
     minimapa: MiniMapa | None = None
+    capa_estatica: CapaEstatica | None = None
+    paso_fijo = PasoFijo()
+    interpolador = InterpoladorPosiciones()
+    recta_jugador_render: pygame.Rect | None = None
+    posiciones_render: dict[pygame.sprite.Sprite, tuple[float, float]] = {}
+    perfilador = PerfiladorCuadro()
+    carga_en_curso: CargaEscena | None = None
 
     estado = "menu"
     estado_anterior = ""
     botones_menu = crear_botones_menu(recta_pantalla, textura_boton_menu)
     botones_escenas = crear_botones_escenas(recta_pantalla, textura_boton_menu)
     botones_opciones = crear_botones_opciones(recta_pantalla, textura_boton_menu)
-    estados_con_musica = {"menu", "seleccion_escena", "opciones"}
+    estados_con_musica = {"menu", "seleccion_escena", "opciones", "cargando"}
     recta_meta_tutorial: pygame.Rect | None = None
     tuberias_verticales_tutorial: list[pygame.sprite.Sprite] = []
     tuberias_tutorial_reparadas = False
     caida_tuberias_iniciada = False
     npc_tutorial = NPCTutorial(RUTA_NPC_TUTORIAL)
     npc_texto_superficie: pygame.Surface | None = None
+    capa_interfaz = CapaInterfaz()
+
+    def dibujar_fondo_menu() -> None:
+        pantalla.fill(configuracion_actual["color_fondo"])
+        titulo = renderizar_texto(fuente_titulo, "Hydrobot", True, (235, 235, 240))
+        pantalla.blit(titulo, titulo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.top + 120)))
+
+    def dibujar_fondo_seleccion() -> None:
+        pantalla.fill(configuracion_actual["color_fondo"])
+
+    def dibujar_fondo_opciones() -> None:
+        pantalla.fill(configuracion_actual["color_fondo"])
+        texto = renderizar_texto(fuente_titulo, "Opciones", True, (235, 235, 240))
+        pantalla.blit(texto, texto.get_rect(center=(recta_pantalla.centerx, recta_pantalla.top + 140)))
+        alto_boton = 68
+        separacion_vertical = 34
+        fila_1_y = recta_pantalla.top + 260
+        fila_2_y = fila_1_y + alto_boton + separacion_vertical
+        fila_3_y = fila_2_y + alto_boton + separacion_vertical
+
+        descripcion_musica = renderizar_texto(fuente_pequena, f"Vol musica: {gestor.obtener_volumen_musica()}", True, (220, 220, 230))
+        descripcion_efectos = renderizar_texto(fuente_pequena, f"Vol efectos: {gestor.obtener_volumen_efectos()}", True, (220, 220, 230))
+        descripcion_toggle = renderizar_texto(fuente_pequena, f"Musica: {gestor.obtener_estado_musica()}", True, (220, 220, 230))
+        pantalla.blit(descripcion_musica, descripcion_musica.get_rect(center=(recta_pantalla.centerx, fila_1_y - alto_boton // 2 - 24)))
+        pantalla.blit(descripcion_efectos, descripcion_efectos.get_rect(center=(recta_pantalla.centerx, fila_2_y - alto_boton // 2 - 24)))
+        pantalla.blit(descripcion_toggle, descripcion_toggle.get_rect(center=(recta_pantalla.centerx, fila_3_y - alto_boton // 2 - 24)))
+
+    def dibujar_fondo_nivel_completado() -> None:
+        pantalla.fill(configuracion_actual["color_fondo"])
+        # Fondo atenuado
+        overlay = pygame.Surface(TAMANO_VENTANA, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        pantalla.blit(overlay, (0, 0))
+        # Cartel
+        texto_titulo = renderizar_texto(fuente_titulo, "¡Felicidades!", True, (235, 235, 240))
+        pantalla.blit(texto_titulo, texto_titulo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery - 60)))
+        minutos = int(tiempo_total_nivel // 60)
+        segundos = tiempo_total_nivel % 60
+        texto_tiempo = renderizar_texto(fuente_mediana, f"Tiempo: {minutos} min {segundos:.2f} s", True, (220, 220, 230))
+        pantalla.blit(texto_tiempo, texto_tiempo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery + 10)))
+        texto_aviso = renderizar_texto(fuente_pequena, "Enter o clic para volver al menu", True, (200, 200, 210))
+        pantalla.blit(texto_aviso, texto_aviso.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery + 60)))
     
     def construir_cuadro_dialogo(texto: str) -> pygame.Surface:
-        superficie_texto = fuente_pequena.render(texto, True, (235, 240, 250))
+        superficie_texto = renderizar_texto(fuente_pequena, texto, True, (235, 240, 250))
         margen = 12
         ancho = superficie_texto.get_width() + margen * 2
         alto = superficie_texto.get_height() + margen * 2
@@ -186,34 +258,24 @@ def ejecutar_juego() -> None:
 
     def cargar_escena(etiqueta: str) -> bool:
         nonlocal configuracion_actual, escena_actual, jugador, grupo_sprites, grupo_extensores, grupo_plataformas, grupo_tuberias
-        nonlocal grupo_particulas, limites_movimiento, altura_mundo, desplazamiento_camara, superficie_fondo_nivel, minimapa
+        nonlocal sistema_particulas, limites_movimiento, altura_mundo, desplazamiento_camara, fondo_nivel, minimapa
         nonlocal estado, estado_anterior, tuberias_tutorial_reparadas, caida_tuberias_iniciada, recta_meta_tutorial, tuberias_verticales_tutorial
         nonlocal npc_texto_superficie
-        nonlocal mostrar_minimapa
-
-        if etiqueta == "tutorial":
-            configuracion_actual = CONFIGURACION_TUTORIAL
-            ruta_mapeado_local = RUTA_MAPEADO_TUTORIAL
-        elif etiqueta in CONFIGURACIONES_ESCENA:
-            configuracion_actual = CONFIGURACIONES_ESCENA[etiqueta]
-            if etiqueta == "1":
-                ruta_mapeado_local = RUTA_MAPEADO_ESCENA1
-            elif etiqueta == "2":
-                ruta_mapeado_local = RUTA_MAPEADO_ESCENA2
-            else:
-                ruta_mapeado_local = RUTA_MAPEADO_ESCENA3
-        else:
+        nonlocal mostrar_minimapa, capa_estatica
+
+        datos_escena = obtener_datos_escena(etiqueta)
+        if datos_escena is None:
             return False
+        configuracion_actual, ruta_mapeado_local, minimo_rotas = datos_escena
 
         escena_actual = etiqueta
-        minimo_rotas = 3 if etiqueta == "1" else 0
         (
             jugador,
             grupo_sprites,
             grupo_extensores,
             grupo_plataformas,
             grupo_tuberias,
-            grupo_particulas,
+            sistema_particulas,
             limites_movimiento,
             altura_mundo,
             _ancho_mundo,
@@ -227,21 +289,23 @@ def ejecutar_juego() -> None:
             minimo_rotas,
         )
 
+        # Los efectos de la escena se decodifican ahora y no en su primera reproduccion
+        gestor.precargar((RUTA_SONIDO_FELICIDADES, RUTA_PARCHE1, RUTA_PARCHE2))
+
         minimapa = MiniMapa()
         if limites_movimiento is not None:
             minimapa.establecer_limites(limites_movimiento)
 
-        if imagen_fondo_base and altura_mundo > 0:
-            ancho_superficie = max(recta_pantalla.width, int(limites_movimiento.right)) if limites_movimiento else recta_pantalla.width
-            alto_superficie = max(recta_pantalla.height, altura_mundo)
-            superficie_fondo_nivel = pygame.Surface((ancho_superficie, alto_superficie)).convert()
-            ancho_tile_f = imagen_fondo_base.get_width()
-            alto_tile_f = imagen_fondo_base.get_height()
-            for y_f in range(0, alto_superficie, alto_tile_f):
-                for x_f in range(0, ancho_superficie, ancho_tile_f):
-                    superficie_fondo_nivel.blit(imagen_fondo_base, (x_f, y_f))
-        else:
-            superficie_fondo_nivel = None
+        if capa_estatica is not None:
+            capa_estatica.desconectar()
+        capa_estatica = CapaEstatica(grupo_plataformas, grupo_tuberias)
+        capa_estatica.preparar(
+            pygame.Rect(int(desplazamiento_camara.x), int(desplazamiento_camara.y), recta_pantalla.width, recta_pantalla.height)
+        )
+
+        fondo_nivel = crear_fondo_nivel(imagen_fondo_base, recta_pantalla, limites_movimiento, altura_mundo)
+        paso_fijo.reiniciar()
+        interpolador.limpiar()
 
         estado = "jugando"
         estado_anterior = "seleccion_escena"
@@ -300,11 +364,15 @@ def ejecutar_juego() -> None:
 
     juego_activo = True
     while juego_activo:
-        dt = reloj.tick(60) / 1000.0
+        # Los menus solo repintan lo que cambia; no hace falta sondearlos tan a menudo
+        dt = reloj.tick(FPS_MENU if estado in ESTADOS_INTERFAZ else FPS_MAXIMO) / 1000.0
+        perfilador.iniciar_cuadro()
 
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT:
                 juego_activo = False
+            elif evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                capa_interfaz.invalidar()
             elif estado == "menu":
                 if botones_menu["jugar"].fue_clic(evento):
                     estado = "seleccion_escena"
@@ -318,7 +386,11 @@ def ejecutar_juego() -> None:
                 else:
                     for etiqueta in ["1", "2", "3", "tutorial"]:
                         if botones_escenas[etiqueta].fue_clic(evento):
-                            if cargar_escena(etiqueta):
+                            datos_escena = obtener_datos_escena(etiqueta)
+                            if datos_escena is not None:
+                                carga_en_curso = CargaEscena(etiqueta, datos_escena[1])
+                                carga_en_curso.iniciar()
+                                estado = "cargando"
                                 break
             elif estado == "opciones":
                 if botones_opciones["volver"].fue_clic(evento):
@@ -340,6 +412,10 @@ def ejecutar_juego() -> None:
                     minimapa = None
                 elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_F1:
                     mostrar_hitboxes = not mostrar_hitboxes
+                elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_F2:
+                    perfilador.visible = not perfilador.visible
+                elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+                    perfilador.exportar_csv()
                 elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_l and grupo_extensores is not None and jugador is not None:
                     for extensor in (grupo_extensores or []):
                         if hasattr(extensor, "ordenar_ir_a_jugador"):
@@ -386,6 +462,44 @@ def ejecutar_juego() -> None:
                     escena_actual = ""
                     minimapa = None
 
+        perfilador.marcar("eventos")
+
+        # La carga pesada va en otro hilo; aqui solo se crean los sprites y se convierten superficies
+        if estado == "cargando" and carga_en_curso is not None and carga_en_curso.terminada:
+            carga_terminada = carga_en_curso
+            carga_en_curso = None
+            if carga_terminada.error is not None:
+                print(f"Error al cargar la escena {carga_terminada.etiqueta}: {carga_terminada.error}")
+                estado = "seleccion_escena"
+            elif not cargar_escena(carga_terminada.etiqueta):
+                estado = "seleccion_escena"
+        perfilador.marcar("carga")
+
+        # Simulacion a paso fijo; el dibujado interpola entre los dos ultimos pasos
+        if estado == "jugando" and grupo_sprites and limites_movimiento and jugador and grupo_extensores is not None:
+            teclas = pygame.key.get_pressed()
+            for _ in range(paso_fijo.avanzar(dt)):
+                interpolador.guardar([jugador, *grupo_extensores])
+                # Solo despiertan las tuberias (y temporizadores del jugador y extensores) con un plazo vencido
+                planificador.avanzar(paso_fijo.paso)
+                perfilador.marcar("tuberias")
+                jugador.update(teclas, paso_fijo.paso, limites_movimiento, grupo_extensores, grupo_plataformas, grupo_tuberias)
+                manejar_extensor_soltado(jugador, grupo_extensores)
+                perfilador.marcar("jugador")
+                if sistema_particulas:
+                    sistema_particulas.update(paso_fijo.paso)
+                perfilador.marcar("particulas")
+                if grupo_extensores:
+                    grupo_extensores.update(paso_fijo.paso, grupo_plataformas, limites_movimiento)
+                perfilador.marcar("extensores")
+            recta_jugador_render = interpolador.recta(jugador, paso_fijo.alfa)
+            posiciones_render = interpolador.posiciones(grupo_extensores, paso_fijo.alfa)
+            actualizar_camara(desplazamiento_camara, recta_jugador_render, limites_movimiento, altura_mundo, recta_pantalla)
+            gestor.establecer_oyente(
+                (desplazamiento_camara.x + recta_pantalla.centerx, desplazamiento_camara.y + recta_pantalla.centery)
+            )
+            gestor.actualizar_voces()
+
         if estado == "jugando" and escena_actual == "1":
             if gestor.musica_habilitada and not gestor.musica_sonando:
                 gestor.reproducir_musica(RUTA_MUSICA_ESCENA1)
@@ -398,130 +512,79 @@ def ejecutar_juego() -> None:
         else:
             gestor.manejar_estado_musica(estado, estados_con_musica)
 
-        if estado == "jugando" and superficie_fondo_nivel is not None:
-            ancho_fondo = superficie_fondo_nivel.get_width()
-            alto_fondo = superficie_fondo_nivel.get_height()
-            x_inicio = 0
-            y_inicio = 0
-            if ancho_fondo > recta_pantalla.width:
-                x_inicio = int(desplazamiento_camara.x)
-                x_max = ancho_fondo - recta_pantalla.width
-                x_inicio = max(0, min(x_inicio, x_max))
-            if alto_fondo > recta_pantalla.height:
-                y_inicio = int(desplazamiento_camara.y)
-                y_max = alto_fondo - recta_pantalla.height
-                y_inicio = max(0, min(y_inicio, y_max))
-            region = pygame.Rect(x_inicio, y_inicio, min(recta_pantalla.width, ancho_fondo), min(recta_pantalla.height, alto_fondo))
-            pantalla.blit(superficie_fondo_nivel.subsurface(region), (0, 0))
-        else:
+        perfilador.saltar()
+        if estado == "jugando" and fondo_nivel is not None:
+            fondo_nivel.dibujar(pantalla, desplazamiento_camara)
+        elif estado not in ESTADOS_INTERFAZ:
             pantalla.fill(configuracion_actual["color_fondo"])
 
         # Transicion y temporizador de inicio del nivel
         if estado_anterior != estado:
+            # Otra pantalla (carga, nivel) pudo dibujar encima: la capa de menus no puede fiarse de su copia
+            capa_interfaz.invalidar()
             if estado == "jugando":
                 tiempo_inicio_nivel = pygame.time.get_ticks() / 1000.0
                 tiempo_total_nivel = 0.0
                 sonido_felicidades_reproducido = False
             estado_anterior = estado
 
+        interfaz_presentada = False
         if estado == "menu":
-            titulo = fuente_titulo.render("Hydrobot", True, (235, 235, 240))
-            pantalla.blit(titulo, titulo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.top + 120)))
-            for boton in botones_menu.values():
-                boton.dibujar(pantalla, fuente_mediana)
+            capa_interfaz.presentar(
+                pantalla,
+                estado,
+                None,
+                dibujar_fondo_menu,
+                [(boton, fuente_mediana) for boton in botones_menu.values()],
+            )
+            interfaz_presentada = True
+        elif estado == "cargando":
+            dibujar_pantalla_carga(
+                pantalla,
+                fuente_mediana,
+                carga_en_curso.progreso if carga_en_curso is not None else 1.0,
+                configuracion_actual["color_fondo"],
+            )
         elif estado == "seleccion_escena":
-            for clave in ["1", "2", "3"]:
-                botones_escenas[clave].dibujar(pantalla, fuente_mediana)
-            botones_escenas["tutorial"].dibujar(pantalla, fuente_mediana)
-            botones_escenas["volver"].dibujar(pantalla, fuente_pequena)
+            capa_interfaz.presentar(
+                pantalla,
+                estado,
+                None,
+                dibujar_fondo_seleccion,
+                [
+                    *((botones_escenas[clave], fuente_mediana) for clave in ["1", "2", "3", "tutorial"]),
+                    (botones_escenas["volver"], fuente_pequena),
+                ],
+            )
+            interfaz_presentada = True
         elif estado == "opciones":
-            texto = fuente_titulo.render("Opciones", True, (235, 235, 240))
-            pantalla.blit(texto, texto.get_rect(center=(recta_pantalla.centerx, recta_pantalla.top + 140)))
-            alto_boton = 68
-            separacion_vertical = 34
-            fila_1_y = recta_pantalla.top + 260
-            fila_2_y = fila_1_y + alto_boton + separacion_vertical
-            fila_3_y = fila_2_y + alto_boton + separacion_vertical
-
-            descripcion_musica = fuente_pequena.render(f"Vol musica: {gestor.obtener_volumen_musica()}", True, (220, 220, 230))
-            descripcion_efectos = fuente_pequena.render(f"Vol efectos: {gestor.obtener_volumen_efectos()}", True, (220, 220, 230))
-            descripcion_toggle = fuente_pequena.render(f"Musica: {gestor.obtener_estado_musica()}", True, (220, 220, 230))
-            pantalla.blit(descripcion_musica, descripcion_musica.get_rect(center=(recta_pantalla.centerx, fila_1_y - alto_boton // 2 - 24)))
-            pantalla.blit(descripcion_efectos, descripcion_efectos.get_rect(center=(recta_pantalla.centerx, fila_2_y - alto_boton // 2 - 24)))
-            pantalla.blit(descripcion_toggle, descripcion_toggle.get_rect(center=(recta_pantalla.centerx, fila_3_y - alto_boton // 2 - 24)))
-            for boton in botones_opciones.values():
-                boton.dibujar(pantalla, fuente_mediana)
+            capa_interfaz.presentar(
+                pantalla,
+                estado,
+                (gestor.obtener_volumen_musica(), gestor.obtener_volumen_efectos(), gestor.obtener_estado_musica()),
+                dibujar_fondo_opciones,
+                [(boton, fuente_mediana) for boton in botones_opciones.values()],
+            )
+            interfaz_presentada = True
         elif estado == "jugando" and grupo_sprites and limites_movimiento and jugador and grupo_extensores is not None:
-            teclas = pygame.key.get_pressed()
-            
-            jugador.update(teclas, dt, limites_movimiento, grupo_extensores, grupo_plataformas, grupo_tuberias)
-            
-            mundo_izquierda = limites_movimiento.left
-            mundo_ancho = limites_movimiento.width
-            mundo_derecha = limites_movimiento.right
-            max_scroll_x = mundo_derecha - recta_pantalla.width
-            if max_scroll_x <= mundo_izquierda:
-                centro_mundo_x = mundo_izquierda + mundo_ancho / 2
-                desplazamiento_camara.x = max(0.0, centro_mundo_x - recta_pantalla.width / 2)
-            else:
-                objetivo_x = jugador.rect.centerx - recta_pantalla.width / 2
-                desplazamiento_camara.x = limitar(objetivo_x, mundo_izquierda, max_scroll_x)
-
-            max_scroll_y = altura_mundo - recta_pantalla.height
-            if max_scroll_y <= 0:
-                desplazamiento_camara.y = 0.0
-            else:
-                objetivo_y = jugador.rect.centery - recta_pantalla.height / 2
-                desplazamiento_camara.y = limitar(objetivo_y, 0.0, max_scroll_y)
-            
-            manejar_extensor_soltado(jugador, grupo_extensores)
-            
-            if grupo_tuberias:
-                grupo_tuberias.update(dt, grupo_particulas)
-            if grupo_particulas:
-                grupo_particulas.update(dt)
-            
-            if grupo_extensores:
-                grupo_extensores.update(dt, grupo_plataformas, limites_movimiento)
-            
+            conteo_render = dibujar_mundo(
+                pantalla,
+                desplazamiento_camara,
+                grupo_plataformas,
+                grupo_tuberias,
+                sistema_particulas,
+                grupo_extensores,
+                capa_estatica,
+                posiciones_render,
+            )
             offset_x = desplazamiento_camara.x
             offset_y = desplazamiento_camara.y
-            if grupo_plataformas:
-                for plataforma in grupo_plataformas:
-                    pantalla.blit(
-                        plataforma.image,
-                        (int(plataforma.rect.x - offset_x), int(plataforma.rect.y - offset_y)),
-                    )
-            if grupo_tuberias:
-                for tuberia in grupo_tuberias:
-                    pantalla.blit(
-                        tuberia.image,
-                        (int(tuberia.rect.x - offset_x), int(tuberia.rect.y - offset_y)),
-                    )
-                    if hasattr(tuberia, "obtener_decal"):
-                        resultado = tuberia.obtener_decal()
-                        if resultado is not None:
-                            decal_superficie, decal_rect = resultado
-                            pantalla.blit(
-                                decal_superficie,
-                                (int(decal_rect.x - offset_x), int(decal_rect.y - offset_y)),
-                            )
-            if grupo_particulas:
-                for particula in grupo_particulas:
-                    pantalla.blit(
-                        particula.image,
-                        (int(particula.rect.x - offset_x), int(particula.rect.y - offset_y)),
-                    )
-            if grupo_extensores:
-                for extensor in grupo_extensores:
-                    pantalla.blit(
-                        extensor.image,
-                        (int(extensor.rect.x - offset_x), int(extensor.rect.y - offset_y)),
-                    )
+            # Lo que acompana al jugador en pantalla sigue a la recta interpolada, no a la simulada
+            recta_dibujo = recta_jugador_render or jugador.rect
             
             recta_npc_pantalla: pygame.Rect | None = None
             if escena_actual == "tutorial" and jugador is not None:
-                npc_tutorial.actualizar_orientacion(jugador.rect)
+                npc_tutorial.actualizar_orientacion(recta_dibujo)
                 recta_npc_pantalla = npc_tutorial.dibujar(
                     pantalla,
                     (int(offset_x), int(offset_y)),
@@ -537,8 +600,9 @@ def ejecutar_juego() -> None:
             if jugador.image:
                 pantalla.blit(
                     jugador.image,
-                    (int(jugador.rect.x - offset_x), int(jugador.rect.y - offset_y)),
+                    (int(recta_dibujo.x - offset_x), int(recta_dibujo.y - offset_y)),
                 )
+            perfilador.marcar("mundo")
             
             if mostrar_hitboxes:
                 if jugador.area_busqueda_reparacion:
@@ -573,7 +637,7 @@ def ejecutar_juego() -> None:
                         )
                         pygame.draw.rect(pantalla, (0, 255, 0), hitbox_pantalla, 4)
                         pygame.draw.line(pantalla, (0, 255, 0), 
-                                       (int(jugador.rect.centerx - offset_x), int(jugador.rect.centery - offset_y)),
+                                       (int(recta_dibujo.centerx - offset_x), int(recta_dibujo.centery - offset_y)),
                                        (int(hitbox.centerx - offset_x), int(hitbox.centery - offset_y)), 3)
                 
                 if grupo_plataformas:
@@ -635,9 +699,8 @@ def ejecutar_juego() -> None:
                                     (int(extensor.rect.x - offset_x), int(extensor.rect.y - offset_y)),
                                 )
                 
-                if grupo_particulas:
-                    for particula in grupo_particulas:
-                        hitbox_particula = particula.rect
+                if sistema_particulas:
+                    for hitbox_particula in sistema_particulas.obtener_rectas():
                         hitbox_pantalla = pygame.Rect(
                             int(hitbox_particula.x - offset_x),
                             int(hitbox_particula.y - offset_y),
@@ -646,7 +709,9 @@ def ejecutar_juego() -> None:
                         )
                         pygame.draw.rect(pantalla, (255, 0, 255), hitbox_pantalla, 1)
                 
-                hitbox_jugador = jugador.obtener_recta_mascara()
+                hitbox_jugador = jugador.obtener_recta_mascara().move(
+                    recta_dibujo.x - jugador.rect.x, recta_dibujo.y - jugador.rect.y
+                )
                 hitbox_pantalla = pygame.Rect(
                     int(hitbox_jugador.x - offset_x),
                     int(hitbox_jugador.y - offset_y),
@@ -659,8 +724,35 @@ def ejecutar_juego() -> None:
                 superficie_mascara_jugador = mascara_jugador.to_surface(setcolor=(255, 0, 0, 100), unsetcolor=(0, 0, 0, 0))
                 pantalla.blit(
                     superficie_mascara_jugador,
-                    (int(jugador.rect.x - offset_x), int(jugador.rect.y - offset_y)),
+                    (int(recta_dibujo.x - offset_x), int(recta_dibujo.y - offset_y)),
+                )
+                
+                # Cambia casi cada cuadro: por la cache solo echaria a los textos de menu
+                texto_conteo = fuente_pequena.render(
+                    f"Dibujados: {conteo_render.visibles}/{conteo_render.totales} bloques: {conteo_render.bloques_estaticos}",
+                    True,
+                    (255, 255, 255),
                 )
+                pantalla.blit(texto_conteo, (10, 10))
+
+            perfilador.dibujar(
+                pantalla,
+                fuente_perfil,
+                {
+                    "plat": len(grupo_plataformas) if grupo_plataformas else 0,
+                    "tub": len(grupo_tuberias) if grupo_tuberias else 0,
+                    "ext": len(grupo_extensores),
+                    "part": len(sistema_particulas) if sistema_particulas else 0,
+                    "horneados": capa_estatica.horneados if capa_estatica else 0,
+                    "texto%": round(cache_texto.tasa_aciertos() * 100),
+                    "sonido_kb": gestor.bytes_decodificados // 1024,
+                    "voces": len(gestor.voces.voces),
+                    "robadas": gestor.voces.robadas,
+                    "rechazadas": gestor.voces.rechazadas,
+                },
+                (10, 40),
+            )
+            perfilador.marcar("depuracion")
 
             if mostrar_minimapa and minimapa is not None:
                 minimapa.dibujar(
@@ -672,6 +764,7 @@ def ejecutar_juego() -> None:
                     desplazamiento_camara,
                     recta_pantalla,
                 )
+            perfilador.marcar("minimapa")
 
             # Comprobacion de nivel completado
             if grupo_tuberias is not None:
@@ -695,21 +788,15 @@ def ejecutar_juego() -> None:
                         sonido_felicidades_reproducido = True
                     estado = "nivel_completado"
         elif estado == "nivel_completado":
-            # Fondo atenuado
-            overlay = pygame.Surface(TAMANO_VENTANA, pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            pantalla.blit(overlay, (0, 0))
-            # Cartel
-            texto_titulo = fuente_titulo.render("¡Felicidades!", True, (235, 235, 240))
-            pantalla.blit(texto_titulo, texto_titulo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery - 60)))
-            minutos = int(tiempo_total_nivel // 60)
-            segundos = tiempo_total_nivel % 60
-            texto_tiempo = fuente_mediana.render(f"Tiempo: {minutos} min {segundos:.2f} s", True, (220, 220, 230))
-            pantalla.blit(texto_tiempo, texto_tiempo.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery + 10)))
-            texto_aviso = fuente_pequena.render("Enter o clic para volver al menu", True, (200, 200, 210))
-            pantalla.blit(texto_aviso, texto_aviso.get_rect(center=(recta_pantalla.centerx, recta_pantalla.centery + 60)))
-
-        pygame.display.flip()
+            capa_interfaz.presentar(pantalla, estado, tiempo_total_nivel, dibujar_fondo_nivel_completado, [])
+            interfaz_presentada = True
+
+        perfilador.saltar()
+        if not interfaz_presentada:
+            pygame.display.flip()
+        if estado == "jugando":
+            perfilador.marcar("flip")
+            perfilador.terminar_cuadro()
 
     gestor.limpiar()
     pygame.quit()
@@ -1,6 +1,8 @@
 import pygame
 from typing import Iterable
 
+from indice_espacial import GrupoEspacial
+
 
 _COLOR_FONDO = (18, 24, 36, 200)
 _COLOR_BORDE = (90, 110, 150)
@@ -8,6 +10,9 @@ _MARGEN = 14
 _TAMANO = (200, 150)
 _ZOOM_MIN = 0.3
 _ZOOM_MAX = 4.0
+_COLOR_DANADA = (255, 120, 80)
+_COLOR_EXTENSOR = (240, 210, 70)
+_COLOR_JUGADOR = (90, 230, 255)
 
 
 def _clamp(valor: float, minimo: float, maximo: float) -> float:
@@ -23,7 +28,12 @@ def _iterar_grupo(grupo: pygame.sprite.Group | Iterable[pygame.sprite.Sprite] |
 
 
 class MiniMapa:
-    """Dibuja un minimapa con texturas reales de los sprites."""
+    """Dibuja un minimapa con texturas reales de plataformas y tuberias.
+
+    La geometria se pre-renderiza en una capa que solo se reconstruye al cambiar
+    los limites, el zoom o la posicion de alguna tuberia; cada cuadro se copia la
+    parte visible y encima se marcan fugas, extensores, jugador y camara.
+    """
 
     def __init__(self, tamano: tuple[int, int] = _TAMANO, margen: int = _MARGEN) -> None:
         self.tamano = tamano
@@ -32,8 +42,16 @@ class MiniMapa:
         self.zoom = 1.0
         self.limites: pygame.Rect | None = None
         self._escala_base = 1.0
+        self._capa_estatica: pygame.Surface | None = None
+        self._escala_capa = 0.0
+        self._grupos_capa: tuple[pygame.sprite.Group | None, pygame.sprite.Group | None] = (None, None)
+        self._sprites_capa: set[pygame.sprite.Sprite] = set()
+
+    def invalidar_capa(self) -> None:
+        self._capa_estatica = None
 
     def establecer_limites(self, limites: pygame.Rect | None) -> None:
+        self.invalidar_capa()
         if limites is None:
             self.limites = None
             self._escala_base = 1.0
@@ -48,7 +66,70 @@ class MiniMapa:
             self._escala_base = 1.0
 
     def ajustar_zoom(self, delta: float) -> None:
-        self.zoom = _clamp(self.zoom + delta, _ZOOM_MIN, _ZOOM_MAX)
+        zoom = _clamp(self.zoom + delta, _ZOOM_MIN, _ZOOM_MAX)
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.invalidar_capa()
+
+    def _al_cambiar_sprite(self, sprite: pygame.sprite.Sprite, recta_anterior: pygame.Rect | None) -> None:
+        en_capa = sprite in self._sprites_capa
+        debe_estar = not getattr(sprite, "en_caida", False)
+        if en_capa != debe_estar or (en_capa and recta_anterior != getattr(sprite, "rect", None)):
+            self.invalidar_capa()
+
+    def _vincular_grupos(
+        self,
+        grupo_plataformas: pygame.sprite.Group | None,
+        grupo_tuberias: pygame.sprite.Group | None,
+    ) -> None:
+        anteriores = self._grupos_capa
+        if anteriores[0] is grupo_plataformas and anteriores[1] is grupo_tuberias:
+            return
+        for grupo in anteriores:
+            if isinstance(grupo, GrupoEspacial) and self._al_cambiar_sprite in grupo.observadores:
+                grupo.observadores.remove(self._al_cambiar_sprite)
+        for grupo in (grupo_plataformas, grupo_tuberias):
+            if isinstance(grupo, GrupoEspacial):
+                grupo.observadores.append(self._al_cambiar_sprite)
+        self._grupos_capa = (grupo_plataformas, grupo_tuberias)
+        self.invalidar_capa()
+
+    def _construir_capa(self, escala: float) -> pygame.Surface:
+        assert self.limites is not None
+        limites = self.limites
+        capa = pygame.Surface(
+            (max(1, int(limites.width * escala)), max(1, int(limites.height * escala))),
+            pygame.SRCALPHA,
+        )
+        capa.fill((0, 0, 0, 0))
+        texturas_escaladas: dict[tuple[int, tuple[int, int]], pygame.Surface] = {}
+        self._sprites_capa = set()
+        for grupo in self._grupos_capa:
+            for sprite in _iterar_grupo(grupo):
+                if getattr(sprite, "en_caida", False):
+                    continue
+                imagen: pygame.Surface | None = getattr(sprite, "image", None)
+                recta_sprite = getattr(sprite, "rect", None)
+                if imagen is None or recta_sprite is None:
+                    continue
+                recta_capa = self._convertir_recta(recta_sprite, escala, 0.0, 0.0)
+                clave = (id(imagen), recta_capa.size)
+                textura = texturas_escaladas.get(clave)
+                if textura is None:
+                    textura = pygame.transform.smoothscale(imagen, recta_capa.size)
+                    texturas_escaladas[clave] = textura
+                capa.blit(textura, recta_capa.topleft)
+                self._sprites_capa.add(sprite)
+        self._escala_capa = escala
+        return capa
+
+    def _convertir_recta(self, recta_mundo: pygame.Rect, escala: float, offset_x: float, offset_y: float) -> pygame.Rect:
+        assert self.limites is not None
+        posicion_x = int(offset_x + (recta_mundo.x - self.limites.left) * escala)
+        posicion_y = int(offset_y + (recta_mundo.y - self.limites.top) * escala)
+        ancho = max(1, int(recta_mundo.width * escala))
+        alto = max(1, int(recta_mundo.height * escala))
+        return pygame.Rect(posicion_x, posicion_y, ancho, alto)
 
     def dibujar(
         self,
@@ -102,45 +183,31 @@ class MiniMapa:
             jugador_centro.y,
         )
 
-        self.superficie.fill((0, 0, 0, 0))
+        self._vincular_grupos(grupo_plataformas, grupo_tuberias)
+        if self._capa_estatica is None or self._escala_capa != escala:
+            self._capa_estatica = self._construir_capa(escala)
+
         self.superficie.fill(_COLOR_FONDO)
+        self.superficie.blit(self._capa_estatica, (int(offset_x), int(offset_y)))
 
         def convertir_recta(recta_mundo: pygame.Rect) -> pygame.Rect:
-            posicion_x = int(offset_x + (recta_mundo.x - limites.left) * escala)
-            posicion_y = int(offset_y + (recta_mundo.y - limites.top) * escala)
-            ancho = max(1, int(recta_mundo.width * escala))
-            alto = max(1, int(recta_mundo.height * escala))
-            return pygame.Rect(posicion_x, posicion_y, ancho, alto)
-
-        def blitear_sprite(sprite: pygame.sprite.Sprite) -> pygame.Rect | None:
-            if not hasattr(sprite, "rect") or not hasattr(sprite, "image"):
-                return None
-            recta_sprite_raw = getattr(sprite, "rect")
-            if recta_sprite_raw is None:
-                return None
-            recta_sprite = pygame.Rect(recta_sprite_raw)
-            imagen: pygame.Surface | None = getattr(sprite, "image", None)
-            if imagen is None:
-                return None
-            recta_minimapa = convertir_recta(recta_sprite)
-            if recta_minimapa.width <= 0 or recta_minimapa.height <= 0:
-                return None
-            textura = pygame.transform.smoothscale(imagen, (recta_minimapa.width, recta_minimapa.height))
-            self.superficie.blit(textura, recta_minimapa.topleft)
-            return recta_minimapa
-
-        for plataforma in _iterar_grupo(grupo_plataformas):
-            blitear_sprite(plataforma)
+            return self._convertir_recta(recta_mundo, escala, offset_x, offset_y)
+
         for tuberia in _iterar_grupo(grupo_tuberias):
-            recta_tuberia = blitear_sprite(tuberia)
-            if recta_tuberia and getattr(tuberia, "danada", False):
-                pygame.draw.rect(self.superficie, (255, 120, 80), recta_tuberia, 2)
+            recta_tuberia = getattr(tuberia, "rect", None)
+            if recta_tuberia is None:
+                continue
+            if getattr(tuberia, "en_caida", False):
+                pygame.draw.rect(self.superficie, _COLOR_BORDE, convertir_recta(recta_tuberia))
+            if getattr(tuberia, "danada", False):
+                pygame.draw.rect(self.superficie, _COLOR_DANADA, convertir_recta(recta_tuberia), 2)
         for extensor in _iterar_grupo(grupo_extensores):
-            blitear_sprite(extensor)
+            recta_extensor = getattr(extensor, "rect", None)
+            if recta_extensor is not None:
+                pygame.draw.rect(self.superficie, _COLOR_EXTENSOR, convertir_recta(recta_extensor))
 
-        recta_jugador_origen = getattr(jugador, "rect", None)
-        if recta_jugador_origen is not None:
-            blitear_sprite(jugador)
+        if jugador_recta is not None:
+            pygame.draw.rect(self.superficie, _COLOR_JUGADOR, convertir_recta(jugador_recta))
 
         recta_camara_mundo = pygame.Rect(
             int(desplazamiento_camara.x),
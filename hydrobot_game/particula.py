@@ -1,5 +1,5 @@
+import numpy as np
 import pygame
-import random
 from rutas import ruta_recurso
 
 RUTAS_PARTICULAS = [
@@ -9,28 +9,125 @@ RUTAS_PARTICULAS = [
     ruta_recurso("texturas", "obj_ecn", "particulas", "p_agua4.png"),
 ]
 
+MAX_PARTICULAS = 1500
 
-class Particula(pygame.sprite.Sprite):
-    def __init__(self, posicion: tuple[int, int], *grupos: pygame.sprite.AbstractGroup) -> None:
-        super().__init__(*grupos)
-        ruta_elegida = random.choice(RUTAS_PARTICULAS)
-        self.image = pygame.image.load(ruta_elegida).convert_alpha()
-        self.rect: pygame.Rect = self.image.get_rect(center=posicion)
-        self.mascara = pygame.mask.from_surface(self.image)
-        self.posicion = pygame.math.Vector2(self.rect.topleft)
-        self.velocidad = pygame.math.Vector2(
-            random.uniform(-30, 30),
-            random.uniform(50, 150)
+
+class SistemaParticulas:
+    """Particulas de agua guardadas en arreglos contiguos y actualizadas en bloque."""
+
+    _texturas: list[pygame.Surface] = []
+
+    def __init__(self, capacidad: int = MAX_PARTICULAS, gravedad: float = 500.0) -> None:
+        self.capacidad = max(0, capacidad)
+        self.gravedad = gravedad
+        self.cantidad = 0
+        self.posiciones = np.zeros((self.capacidad, 2), dtype=np.float32)
+        self.velocidades = np.zeros((self.capacidad, 2), dtype=np.float32)
+        self.tiempos_vida = np.zeros(self.capacidad, dtype=np.float32)
+        self.tipos = np.zeros(self.capacidad, dtype=np.int8)
+        self._generador = np.random.default_rng()
+        self.texturas = self._cargar_texturas()
+        self._medios_tamanos = np.array(
+            [(textura.get_width() // 2, textura.get_height() // 2) for textura in self.texturas],
+            dtype=np.float32,
         )
-        self.tiempo_vida = random.uniform(0.5, 1.5)
-        self.gravedad = 500.0
+        self._tamanos = [textura.get_size() for textura in self.texturas]
+
+    @classmethod
+    def _cargar_texturas(cls) -> list[pygame.Surface]:
+        if not cls._texturas:
+            texturas: list[pygame.Surface] = []
+            for ruta in RUTAS_PARTICULAS:
+                try:
+                    texturas.append(pygame.image.load(ruta).convert_alpha())
+                except pygame.error:
+                    continue
+            if not texturas:
+                placeholder = pygame.Surface((4, 4), pygame.SRCALPHA)
+                placeholder.fill((80, 160, 255, 220))
+                texturas.append(placeholder)
+            cls._texturas = texturas
+        return cls._texturas
+
+    def __len__(self) -> int:
+        return self.cantidad
+
+    def emitir(self, centro: tuple[int, int], cantidad: int = 1, dispersion: int = 0) -> int:
+        libres = self.capacidad - self.cantidad
+        cantidad = min(cantidad, libres)
+        if cantidad <= 0:
+            return 0
+        inicio = self.cantidad
+        fin = inicio + cantidad
+        tipos = self._generador.integers(0, len(self.texturas), cantidad)
+        centros = np.empty((cantidad, 2), dtype=np.float32)
+        centros[:, 0] = centro[0]
+        centros[:, 1] = centro[1]
+        if dispersion > 0:
+            centros += self._generador.integers(-dispersion, dispersion + 1, (cantidad, 2))
+        self.tipos[inicio:fin] = tipos
+        self.posiciones[inicio:fin] = centros - self._medios_tamanos[tipos]
+        self.velocidades[inicio:fin, 0] = self._generador.uniform(-30.0, 30.0, cantidad)
+        self.velocidades[inicio:fin, 1] = self._generador.uniform(50.0, 150.0, cantidad)
+        self.tiempos_vida[inicio:fin] = self._generador.uniform(0.5, 1.5, cantidad)
+        self.cantidad = fin
+        return cantidad
 
     def update(self, dt: float) -> None:
-        self.tiempo_vida -= dt
-        if self.tiempo_vida <= 0:
-            self.kill()
+        if self.cantidad == 0:
+            return
+        n = self.cantidad
+        vida = self.tiempos_vida[:n]
+        vida -= dt
+        vivas = vida > 0.0
+        restantes = int(np.count_nonzero(vivas))
+        if restantes < n:
+            self.posiciones[:restantes] = self.posiciones[:n][vivas]
+            self.velocidades[:restantes] = self.velocidades[:n][vivas]
+            self.tiempos_vida[:restantes] = self.tiempos_vida[:n][vivas]
+            self.tipos[:restantes] = self.tipos[:n][vivas]
+            self.cantidad = n = restantes
+        if n == 0:
             return
-        
-        self.velocidad.y += self.gravedad * dt
-        self.posicion += self.velocidad * dt
-        self.rect.topleft = (round(self.posicion.x), round(self.posicion.y))
+        velocidades = self.velocidades[:n]
+        velocidades[:, 1] += self.gravedad * dt
+        self.posiciones[:n] += velocidades * dt
+
+    def _posiciones_enteras(self) -> np.ndarray:
+        return np.rint(self.posiciones[:self.cantidad]).astype(np.int32)
+
+    def dibujar(
+        self,
+        superficie: pygame.Surface,
+        desplazamiento: tuple[float, float] = (0.0, 0.0),
+        recta_visible: pygame.Rect | None = None,
+    ) -> int:
+        """Dibuja las particulas y devuelve cuantas se enviaron a la superficie."""
+        if self.cantidad == 0:
+            return 0
+        posiciones = (
+            np.rint(self.posiciones[:self.cantidad]) - np.array(desplazamiento, dtype=np.float32)
+        ).astype(np.int32)
+        tipos = self.tipos[:self.cantidad]
+        if recta_visible is not None:
+            izquierda = recta_visible.left - int(desplazamiento[0])
+            arriba = recta_visible.top - int(desplazamiento[1])
+            ancho_max, alto_max = np.max(self._medios_tamanos, axis=0) * 2
+            visibles = (
+                (posiciones[:, 0] > izquierda - ancho_max)
+                & (posiciones[:, 0] < izquierda + recta_visible.width)
+                & (posiciones[:, 1] > arriba - alto_max)
+                & (posiciones[:, 1] < arriba + recta_visible.height)
+            )
+            posiciones = posiciones[visibles]
+            tipos = tipos[visibles]
+        for indice, textura in enumerate(self.texturas):
+            destinos = posiciones[tipos == indice].tolist()
+            if destinos:
+                superficie.blits([(textura, destino) for destino in destinos], doreturn=False)
+        return len(posiciones)
+
+    def obtener_rectas(self) -> list[pygame.Rect]:
+        posiciones = self._posiciones_enteras().tolist()
+        tipos = self.tipos[:self.cantidad].tolist()
+        return [pygame.Rect(posicion, self._tamanos[tipo]) for posicion, tipo in zip(posiciones, tipos)]
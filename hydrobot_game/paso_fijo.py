@@ -0,0 +1,70 @@
+import pygame
+from typing import Iterable
+
+PASO_SIMULACION = 1.0 / 60.0
+MAX_SUBPASOS = 5
+# Saltos mayores que esto (reaparicion, cambio de escena) no se interpolan.
+_SALTO_MAXIMO = 256.0
+
+
+class PasoFijo:
+    """Reparte el tiempo real del cuadro en pasos de simulacion de duracion fija.
+
+    El sobrante queda en el acumulador para el siguiente cuadro y `alfa` indica
+    cuanto se ha avanzado hacia el proximo paso, para interpolar al dibujar.
+    Si un cuadro tarda demasiado se simulan como maximo `max_subpasos` pasos y el
+    resto del retraso se descarta en vez de acumularse.
+    """
+
+    def __init__(self, paso: float = PASO_SIMULACION, max_subpasos: int = MAX_SUBPASOS) -> None:
+        self.paso = paso
+        self.max_subpasos = max(1, max_subpasos)
+        self.acumulador = 0.0
+        self.alfa = 0.0
+
+    def avanzar(self, dt: float) -> int:
+        """Suma `dt` al acumulador y devuelve cuantos pasos hay que simular ahora."""
+        self.acumulador += max(0.0, dt)
+        pasos = int(self.acumulador / self.paso)
+        if pasos > self.max_subpasos:
+            sobrante = (pasos - self.max_subpasos) * self.paso
+            self.acumulador -= sobrante
+            pasos = self.max_subpasos
+        self.acumulador -= pasos * self.paso
+        self.alfa = min(1.0, self.acumulador / self.paso)
+        return pasos
+
+    def reiniciar(self) -> None:
+        self.acumulador = 0.0
+        self.alfa = 0.0
+
+
+class InterpoladorPosiciones:
+    """Recuerda donde estaban los sprites antes del ultimo paso para dibujarlos entre dos pasos."""
+
+    def __init__(self) -> None:
+        self._anteriores: dict[pygame.sprite.Sprite, tuple[int, int]] = {}
+
+    def guardar(self, sprites: Iterable[pygame.sprite.Sprite]) -> None:
+        self._anteriores = {sprite: sprite.rect.topleft for sprite in sprites if sprite.rect is not None}
+
+    def limpiar(self) -> None:
+        self._anteriores.clear()
+
+    def posicion(self, sprite: pygame.sprite.Sprite, alfa: float) -> tuple[float, float]:
+        actual_x, actual_y = sprite.rect.topleft
+        anterior = self._anteriores.get(sprite)
+        if anterior is None:
+            return float(actual_x), float(actual_y)
+        dx = actual_x - anterior[0]
+        dy = actual_y - anterior[1]
+        if abs(dx) > _SALTO_MAXIMO or abs(dy) > _SALTO_MAXIMO:
+            return float(actual_x), float(actual_y)
+        return anterior[0] + dx * alfa, anterior[1] + dy * alfa
+
+    def posiciones(self, sprites: Iterable[pygame.sprite.Sprite], alfa: float) -> dict[pygame.sprite.Sprite, tuple[float, float]]:
+        return {sprite: self.posicion(sprite, alfa) for sprite in sprites}
+
+    def recta(self, sprite: pygame.sprite.Sprite, alfa: float) -> pygame.Rect:
+        x, y = self.posicion(sprite, alfa)
+        return pygame.Rect(round(x), round(y), sprite.rect.width, sprite.rect.height)
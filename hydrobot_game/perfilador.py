@@ -0,0 +1,147 @@
+import csv
+import os
+import time
+from collections import deque
+
+import pygame
+
+from rutas import ruta_cache
+
+FASES = (
+    "eventos",
+    "carga",
+    "jugador",
+    "tuberias",
+    "particulas",
+    "extensores",
+    "mundo",
+    "depuracion",
+    "minimapa",
+    "flip",
+)
+
+_CUADROS_VENTANA = 240
+_REFRESCO_TEXTO = 15
+_ALTO_GRAFICA = 50
+_CONTEOS_POR_LINEA = 4
+_COLOR_FONDO = (10, 12, 20, 210)
+_COLOR_TEXTO = (225, 230, 240)
+_COLOR_GRAFICA = (110, 220, 140)
+_COLOR_LIMITE = (240, 90, 90)
+_OBJETIVO_CUADRO = 1.0 / 60.0
+
+
+class PerfiladorCuadro:
+    """Mide cuanto tarda cada fase del cuadro y guarda una ventana de los ultimos cuadros.
+
+    `marcar(fase)` suma a esa fase el tiempo transcurrido desde la marca anterior,
+    asi una fase repetida en varios pasos de simulacion se acumula en el mismo cuadro.
+    """
+
+    def __init__(self, cuadros_ventana: int = _CUADROS_VENTANA) -> None:
+        self.visible = False
+        self.ventana: deque[dict[str, float]] = deque(maxlen=cuadros_ventana)
+        self._actual: dict[str, float] = {}
+        self._inicio = 0.0
+        self._ultimo = 0.0
+        self._cuadros_desde_refresco = _REFRESCO_TEXTO
+        self._panel: pygame.Surface | None = None
+
+    def iniciar_cuadro(self) -> None:
+        self._actual = dict.fromkeys(FASES, 0.0)
+        self._inicio = self._ultimo = time.perf_counter()
+
+    def marcar(self, fase: str) -> None:
+        ahora = time.perf_counter()
+        if fase in self._actual:
+            self._actual[fase] += ahora - self._ultimo
+        self._ultimo = ahora
+
+    def saltar(self) -> None:
+        """Descarta el tiempo desde la ultima marca (trabajo que no pertenece a ninguna fase)."""
+        self._ultimo = time.perf_counter()
+
+    def terminar_cuadro(self) -> None:
+        if not self._actual:
+            return
+        self._actual["total"] = time.perf_counter() - self._inicio
+        self.ventana.append(self._actual)
+        self._actual = {}
+
+    def medias(self) -> dict[str, float]:
+        if not self.ventana:
+            return {}
+        cantidad = len(self.ventana)
+        return {fase: sum(cuadro.get(fase, 0.0) for cuadro in self.ventana) / cantidad for fase in (*FASES, "total")}
+
+    def exportar_csv(self, ruta: str | None = None) -> str | None:
+        """Vuelca la ventana actual a CSV (en milisegundos) y devuelve la ruta escrita."""
+        if ruta is None:
+            ruta = ruta_cache("perfiles", time.strftime("perfil_%Y%m%d_%H%M%S.csv"))
+        columnas = (*FASES, "total")
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(("cuadro", *columnas))
+                for indice, cuadro in enumerate(self.ventana):
+                    escritor.writerow((indice, *(f"{cuadro.get(fase, 0.0) * 1000:.3f}" for fase in columnas)))
+        except OSError as error:
+            print(f"Error al guardar el perfil en {ruta}: {error}")
+            return None
+        print(f"Perfil guardado en {ruta}")
+        return ruta
+
+    def _construir_panel(self, fuente: pygame.font.Font, conteos: dict[str, int]) -> pygame.Surface:
+        medias = self.medias()
+        filas = [
+            (fuente.render(fase, True, _COLOR_TEXTO), fuente.render(f"{medias.get(fase, 0.0) * 1000:.2f} ms", True, _COLOR_TEXTO))
+            for fase in (*FASES, "total")
+        ]
+        elementos = [f"{nombre}:{cantidad}" for nombre, cantidad in conteos.items()]
+        lineas_conteos = [
+            fuente.render(" ".join(elementos[inicio:inicio + _CONTEOS_POR_LINEA]), True, _COLOR_TEXTO)
+            for inicio in range(0, len(elementos), _CONTEOS_POR_LINEA)
+        ]
+        alto_linea = fuente.get_linesize()
+        ancho_nombres = max(nombre.get_width() for nombre, _ in filas)
+        ancho_valores = max(valor.get_width() for _, valor in filas)
+        ancho_conteos = max((linea.get_width() for linea in lineas_conteos), default=0)
+        ancho = max(220, ancho_nombres + ancho_valores + 28, ancho_conteos + 16)
+        alto = alto_linea * (len(filas) + len(lineas_conteos)) + _ALTO_GRAFICA + 20
+        panel = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        panel.fill(_COLOR_FONDO)
+        y = 6
+        for nombre, valor in filas:
+            panel.blit(nombre, (8, y))
+            panel.blit(valor, (ancho - 8 - valor.get_width(), y))
+            y += alto_linea
+        for linea in lineas_conteos:
+            panel.blit(linea, (8, y))
+            y += alto_linea
+        return panel
+
+    def _dibujar_grafica(self, panel: pygame.Surface) -> None:
+        alto_grafica = _ALTO_GRAFICA
+        recta = pygame.Rect(8, panel.get_height() - alto_grafica - 6, panel.get_width() - 16, alto_grafica)
+        panel.fill(_COLOR_FONDO, recta)
+        escala = alto_grafica / (_OBJETIVO_CUADRO * 2)
+        y_limite = recta.bottom - int(_OBJETIVO_CUADRO * escala)
+        pygame.draw.line(panel, _COLOR_LIMITE, (recta.left, y_limite), (recta.right - 1, y_limite))
+        totales = [cuadro.get("total", 0.0) for cuadro in self.ventana][-recta.width:]
+        x = recta.right - len(totales)
+        for total in totales:
+            altura = min(alto_grafica, int(total * escala))
+            if altura > 0:
+                pygame.draw.line(panel, _COLOR_GRAFICA, (x, recta.bottom - 1), (x, recta.bottom - altura))
+            x += 1
+
+    def dibujar(self, pantalla: pygame.Surface, fuente: pygame.font.Font, conteos: dict[str, int], posicion: tuple[int, int]) -> None:
+        if not self.visible:
+            return
+        self._cuadros_desde_refresco += 1
+        if self._panel is None or self._cuadros_desde_refresco >= _REFRESCO_TEXTO:
+            self._panel = self._construir_panel(fuente, conteos)
+            self._cuadros_desde_refresco = 0
+        self._dibujar_grafica(self._panel)
+        pantalla.blit(self._panel, posicion)
@@ -1,13 +1,28 @@
 import pygame
 from typing import TYPE_CHECKING
 from animador import AnimadorGif
+from indice_espacial import sprites_cercanos
 from tuberia import Tuberia
-from sprite_base import SpriteConMascara
+from sprite_base import SpriteConMascara, altura_aterrizaje
 from rutas import ruta_recurso
+from temporizador import Temporizador, planificador
 
 if TYPE_CHECKING:
     from gestor_sonido import GestorSonido
 
+RUTA_ROBOT_ANDAR = ruta_recurso("texturas", "robot", "robot_andar.gif")
+RUTA_ROBOT_CORRER = ruta_recurso("texturas", "robot", "robot_correr.gif")
+RUTA_GRANBOT_ANDAR = ruta_recurso("texturas", "robot", "granbot_andar.gif")
+RUTA_GRANBOT_CORRER = ruta_recurso("texturas", "robot", "granbot_correr.gif")
+RUTA_ROBOT_SOLDAR = ruta_recurso("texturas", "robot", "soldar.gif")
+RUTAS_ANIMACIONES_JUGADOR = (
+    RUTA_ROBOT_ANDAR,
+    RUTA_ROBOT_CORRER,
+    RUTA_GRANBOT_ANDAR,
+    RUTA_GRANBOT_CORRER,
+    RUTA_ROBOT_SOLDAR,
+)
+
 
 class Jugador(SpriteConMascara):
     """Jugador plataformero con sistema de extensor."""
@@ -23,10 +38,10 @@ class Jugador(SpriteConMascara):
         
         self.gestor_sonido = gestor_sonido
         self.tiene_extensor = True
-        self.ruta_robot_andar = ruta_recurso("texturas", "robot", "robot_andar.gif")
-        self.ruta_robot_correr = ruta_recurso("texturas", "robot", "robot_correr.gif")
-        self.ruta_granbot_andar = ruta_recurso("texturas", "robot", "granbot_andar.gif")
-        self.ruta_granbot_correr = ruta_recurso("texturas", "robot", "granbot_correr.gif")
+        self.ruta_robot_andar = RUTA_ROBOT_ANDAR
+        self.ruta_robot_correr = RUTA_ROBOT_CORRER
+        self.ruta_granbot_andar = RUTA_GRANBOT_ANDAR
+        self.ruta_granbot_correr = RUTA_GRANBOT_CORRER
         
         self.tamano_sprite = tamano
         
@@ -37,9 +52,15 @@ class Jugador(SpriteConMascara):
         self._cargar_animadores()
         self._actualizar_stats()
         
-        self.image = self._escalar_fotograma(self.animador_actual.obtener_fotograma_actual()) if self.animador_actual else pygame.Surface((tamano, tamano))
-        self.rect: pygame.Rect = self.image.get_rect(topleft=posicion_inicio)
-        self.mascara = pygame.mask.from_surface(self.image)
+        if self.animador_actual:
+            fotograma_inicial = self.animador_actual.obtener_fotograma_preparado((tamano, tamano))
+            self.image = fotograma_inicial.imagen
+            self.rect: pygame.Rect = self.image.get_rect(topleft=posicion_inicio)
+            self.establecer_perfil(fotograma_inicial.perfil)
+        else:
+            self.image = pygame.Surface((tamano, tamano))
+            self.rect = self.image.get_rect(topleft=posicion_inicio)
+            self.mascara = pygame.mask.from_surface(self.image)
 
         self.posicion = pygame.math.Vector2(posicion_inicio)
         self.velocidad = pygame.math.Vector2(0.0, 0.0)
@@ -58,16 +79,16 @@ class Jugador(SpriteConMascara):
         self.extensor_objetivo: pygame.sprite.Sprite | None = None
         self.extensor_recien_creado = False
         self.direccion_extensor_soltado = 1
-        self.cooldown_e = 0.0
+        self.fin_cooldown_e = 0.0
         self.tiempo_cooldown_e = 0.3
-        self.ruta_robot_soldar = ruta_recurso("texturas", "robot", "soldar.gif")
+        self.ruta_robot_soldar = RUTA_ROBOT_SOLDAR
         self.animador_soldar: AnimadorGif | None = None
         self.soldando = False
         self.tiempo_soldadura_total = 3.0
-        self.tiempo_soldadura_restante = 0.0
+        self._temporizador_soldadura: Temporizador | None = None
         self.tuberia_objetivo_soldar: Tuberia | None = None
         self.tiempo_gracia_borde = 0.1
-        self.tiempo_gracia_restante = 0.0
+        self.fin_gracia = 0.0
         self.area_busqueda_reparacion: pygame.Rect | None = None
         self.tuberias_en_rango: list[Tuberia] = []
         
@@ -94,13 +115,20 @@ class Jugador(SpriteConMascara):
             self.animador_correr = AnimadorGif(self.ruta_robot_correr, velocidad_fotogramas=80)
             self.animador_soldar = AnimadorGif(self.ruta_robot_soldar, velocidad_fotogramas=100)
         self.animador_actual = self.animador_andar
+        tamano = (self.tamano_sprite, self.tamano_sprite)
+        for animador in (self.animador_andar, self.animador_correr, self.animador_soldar):
+            if animador is None:
+                continue
+            animador.preparar_fotogramas(tamano, False)
+            animador.preparar_fotogramas(tamano, True)
 
     def _registrar_efectos_sonido(self) -> None:
-        self.gestor_sonido.registrar_efecto(self.clave_movimiento_robot, self.ruta_robot_movimiento, canal=1, volumen=0.35)
-        self.gestor_sonido.registrar_efecto(self.clave_movimiento_granbot, self.ruta_granbot_movimiento, canal=1, volumen=0.2)
-        self.gestor_sonido.registrar_efecto(self.clave_extensor_bajar, self.ruta_granbot_bajar, volumen=0.2)
-        self.gestor_sonido.registrar_efecto(self.clave_soldadura_inicio, self.ruta_soldar1, canal=2, volumen=0.2)
-        self.gestor_sonido.registrar_efecto(self.clave_soldadura_bucle, self.ruta_soldar2, canal=3, volumen=0.2)
+        gestor = self.gestor_sonido
+        gestor.registrar_efecto(self.clave_movimiento_robot, self.ruta_robot_movimiento, volumen=0.35, categoria="robot")
+        gestor.registrar_efecto(self.clave_movimiento_granbot, self.ruta_granbot_movimiento, volumen=0.2, categoria="robot")
+        gestor.registrar_efecto(self.clave_extensor_bajar, self.ruta_granbot_bajar, volumen=0.2, categoria="robot")
+        gestor.registrar_efecto(self.clave_soldadura_inicio, self.ruta_soldar1, volumen=0.2, categoria="soldadura")
+        gestor.registrar_efecto(self.clave_soldadura_bucle, self.ruta_soldar2, volumen=0.2, categoria="soldadura")
 
     def _detener_sonido_movimiento(self) -> None:
         if self.clave_movimiento_activa is None:
@@ -146,24 +174,12 @@ class Jugador(SpriteConMascara):
             self.velocidad.x = 0.0
             self.velocidad.y = 0.0
             self._detener_sonido_movimiento()
-            self.tiempo_soldadura_restante -= dt
             if self.animador_soldar:
                 self.animador_actual = self.animador_soldar
                 self.animador_soldar.reanudar()
                 self.animador_soldar.actualizar(dt)
-            if self.tiempo_soldadura_restante <= 0.0:
-                self.soldando = False
-                self.gestor_sonido.detener_efecto(self.clave_soldadura_bucle)
-                if isinstance(self.tuberia_objetivo_soldar, Tuberia):
-                    try:
-                        self.tuberia_objetivo_soldar.reparar()
-                    except Exception:
-                        pass
-                self.tuberia_objetivo_soldar = None
-                self.animador_actual = self.animador_andar
-            else:
-                self._actualizar_imagen()
-                return
+            self._actualizar_imagen()
+            return
         self.sobre_extensor = False
         self.sobre_plataforma = False
         self.sobre_tuberia = False
@@ -178,9 +194,6 @@ class Jugador(SpriteConMascara):
         self.posicion_extensor_soltado = None
         self.extensor_equipado = False
         
-        if self.cooldown_e > 0.0:
-            self.cooldown_e -= dt
-        
         hitbox_inicial = self.obtener_recta_mascara()
         self.en_suelo = hitbox_inicial.bottom >= recta_limite.bottom
         
@@ -207,9 +220,8 @@ class Jugador(SpriteConMascara):
             self.puede_saltar = False
 
         # Ayuda anti-desnivel para tuberias h±1: evitar caidas por pequeños escalones
-        self.tiempo_gracia_restante = max(0.0, self.tiempo_gracia_restante - dt)
         tecla_bajar = teclas[pygame.K_s] or teclas[pygame.K_DOWN]
-        if (not self.en_suelo) and self.tiempo_gracia_restante > 0.0 and self.velocidad.y >= 0.0 and not tecla_bajar:
+        if (not self.en_suelo) and planificador.ahora < self.fin_gracia and self.velocidad.y >= 0.0 and not tecla_bajar:
             self._intentar_snap_suelo(hitbox_post, (grupo_plataformas, grupo_extensores, grupo_tuberias))
         
         self._manejar_bajar_plataforma(teclas, grupo_plataformas)
@@ -356,23 +368,25 @@ class Jugador(SpriteConMascara):
         if self.animador_actual is None:
             return
             
-        fotograma = self.animador_actual.obtener_fotograma_actual()
-        imagen_escalada = self._escalar_fotograma(fotograma)
-        
-        if self.ultima_direccion < 0:
-            imagen_escalada = pygame.transform.flip(imagen_escalada, True, False)
-        
-        self.image = imagen_escalada
-        self.mascara = pygame.mask.from_surface(self.image)
+        fotograma = self.animador_actual.obtener_fotograma_preparado(
+            (self.tamano_sprite, self.tamano_sprite),
+            self.ultima_direccion < 0,
+        )
+        self.image = fotograma.imagen
+        self.establecer_perfil(fotograma.perfil)
 
     def _detectar_extensor(self, grupo_extensores: pygame.sprite.Group) -> None:
-        if self.mascara.count() == 0:
+        if self.contar_pixeles_mascara() == 0:
             return
         for extensor in grupo_extensores:
             if not hasattr(extensor, "obtener_mascara"):
                 continue
             mascara_sprite = extensor.obtener_mascara()
-            if mascara_sprite.count() == 0:
+            if hasattr(extensor, "contar_pixeles_mascara"):
+                pixeles_sprite = extensor.contar_pixeles_mascara()
+            else:
+                pixeles_sprite = mascara_sprite.count()
+            if pixeles_sprite == 0:
                 continue
             desplazamiento = (extensor.rect.left - self.rect.left, extensor.rect.top - self.rect.top)
             if self.mascara.overlap(mascara_sprite, desplazamiento):
@@ -382,68 +396,82 @@ class Jugador(SpriteConMascara):
                 break
 
     def _detectar_tuberia_debajo(self, grupo_tuberias: pygame.sprite.Group) -> None:
-        if self.mascara.count() == 0:
+        if self.contar_pixeles_mascara() == 0:
             return
-        hitbox_jugador = self.obtener_recta_mascara()
+        pies_izquierda, pies_derecha, pies_y = self.obtener_linea_pies()
         margen_deteccion = 5
-        for tuberia in grupo_tuberias:
+        zona_deteccion = pygame.Rect(
+            pies_izquierda,
+            pies_y - margen_deteccion,
+            pies_derecha - pies_izquierda,
+            margen_deteccion * 2 + 1,
+        )
+        for tuberia in sprites_cercanos(grupo_tuberias, zona_deteccion):
             if not hasattr(tuberia, "obtener_recta_mascara"):
                 continue
             hitbox_tuberia = tuberia.obtener_recta_mascara()
-            if abs(hitbox_jugador.bottom - hitbox_tuberia.top) <= margen_deteccion:
-                if not (hitbox_jugador.right <= hitbox_tuberia.left or hitbox_jugador.left >= hitbox_tuberia.right):
+            if abs(pies_y - hitbox_tuberia.top) <= margen_deteccion:
+                if not (pies_derecha <= hitbox_tuberia.left or pies_izquierda >= hitbox_tuberia.right):
                     self.sobre_tuberia = True
                     break
 
     def _manejar_colision_plataforma(self, grupo_extensores: pygame.sprite.Group, posicion_previa: pygame.math.Vector2) -> None:
         hitbox = self.obtener_recta_mascara()
-        for extensor in grupo_extensores:
-            hitbox_extensor = extensor.obtener_recta_mascara()
-            if not hitbox.colliderect(hitbox_extensor):
-                continue
-            
-            mascara_extensor = extensor.obtener_mascara()
-            desplazamiento = (extensor.rect.left - self.rect.left, extensor.rect.top - self.rect.top)
-            if not self.mascara.overlap(mascara_extensor, desplazamiento):
-                continue
+        hitbox_previa = hitbox.move(round(posicion_previa.x) - self.rect.left, round(posicion_previa.y) - self.rect.top)
+        pies_izquierda, pies_derecha, _ = self.obtener_linea_pies()
+        for extensor in sprites_cercanos(grupo_extensores, hitbox.union(hitbox_previa)):
+            # Los tiles estaticos traen sus repisas compiladas: basta un test de intervalos
+            repisas = extensor.obtener_repisas() if hasattr(extensor, "obtener_repisas") else []
+            if repisas:
+                y_repisa = altura_aterrizaje(repisas, pies_izquierda, pies_derecha, hitbox_previa.bottom, hitbox.bottom)
+                if y_repisa is None:
+                    continue
+            else:
+                hitbox_extensor = extensor.obtener_recta_mascara()
+                if not hitbox.colliderect(hitbox_extensor):
+                    continue
+                # Aterrizaje de un solo sentido: solo cuenta si los pies quedan sobre el objeto
+                if pies_derecha <= hitbox_extensor.left or pies_izquierda >= hitbox_extensor.right:
+                    continue
+                
+                mascara_extensor = extensor.obtener_mascara()
+                desplazamiento = (extensor.rect.left - self.rect.left, extensor.rect.top - self.rect.top)
+                if not self.mascara.overlap(mascara_extensor, desplazamiento):
+                    continue
+                if hitbox_previa.bottom > hitbox_extensor.top:
+                    continue
+                y_repisa = hitbox_extensor.top
             
-            hitbox_previa = pygame.Rect(
-                round(posicion_previa.x) + (hitbox.left - self.rect.left),
-                round(posicion_previa.y) + (hitbox.top - self.rect.top),
-                hitbox.width,
-                hitbox.height
-            )
+            diferencia = hitbox.bottom - y_repisa
+            self.rect.bottom -= diferencia
+            self.posicion.y = float(self.rect.y)
+            self.velocidad.y = 0.0
+            self.en_suelo = True
+            self.puede_saltar = True
+            self.fin_gracia = planificador.ahora + self.tiempo_gracia_borde
             
-            if hitbox_previa.bottom <= hitbox_extensor.top:
-                diferencia = hitbox.bottom - hitbox_extensor.top
-                self.rect.bottom -= diferencia
-                self.posicion.y = float(self.rect.y)
-                self.velocidad.y = 0.0
-                self.en_suelo = True
-                self.puede_saltar = True
-                self.tiempo_gracia_restante = self.tiempo_gracia_borde
-                
-                from plataforma import Plataforma
-                from tuberia import Tuberia
-                if isinstance(extensor, Plataforma):
-                    self.sobre_plataforma = True
-                elif isinstance(extensor, Tuberia) and not self.tiene_extensor:
-                    self.sobre_tuberia = True
-                else:
-                    self.sobre_extensor = True
-                break
+            from plataforma import Plataforma
+            if isinstance(extensor, Plataforma):
+                self.sobre_plataforma = True
+            elif isinstance(extensor, Tuberia) and not self.tiene_extensor:
+                self.sobre_tuberia = True
+            else:
+                self.sobre_extensor = True
+            break
 
     def _intentar_snap_suelo(self, hitbox_post: pygame.Rect, grupos: tuple[pygame.sprite.Group | None, ...]) -> None:
         margen_snap = 4
+        pies_izquierda, pies_derecha, _ = self.obtener_linea_pies()
+        zona_snap = pygame.Rect(pies_izquierda, hitbox_post.bottom, pies_derecha - pies_izquierda, margen_snap + 1)
         for grupo in grupos:
             if not grupo:
                 continue
-            for sprite in grupo:
+            for sprite in sprites_cercanos(grupo, zona_snap):
                 if not hasattr(sprite, "obtener_recta_mascara"):
                     continue
                 recta = sprite.obtener_recta_mascara()
                 # Comprobar solape horizontal
-                solapa_horizontal = not (hitbox_post.right <= recta.left or hitbox_post.left >= recta.right)
+                solapa_horizontal = not (pies_derecha <= recta.left or pies_izquierda >= recta.right)
                 if not solapa_horizontal:
                     continue
                 # Comprobar que estamos justo encima dentro del margen
@@ -455,14 +483,14 @@ class Jugador(SpriteConMascara):
                     self.velocidad.y = 0.0
                     self.en_suelo = True
                     self.puede_saltar = True
-                    self.tiempo_gracia_restante = self.tiempo_gracia_borde
+                    self.fin_gracia = planificador.ahora + self.tiempo_gracia_borde
                     return
 
 
     def _manejar_tecla_e(self, teclas: pygame.key.ScancodeWrapper) -> tuple[int, int] | None:
         if self.soldando:
             return None
-        if not teclas[pygame.K_l] or self.cooldown_e > 0.0:
+        if not teclas[pygame.K_l] or planificador.ahora < self.fin_cooldown_e:
             return None
         
         if not self.en_suelo and not (self.sobre_plataforma or self.sobre_tuberia or self.sobre_extensor):
@@ -471,17 +499,14 @@ class Jugador(SpriteConMascara):
         if self.sobre_extensor and not self.tiene_extensor and self.recta_extensor_actual is not None:
             self.equipar_extensor(self.recta_extensor_actual)
             self.extensor_equipado = True
-            self.cooldown_e = self.tiempo_cooldown_e
+            self.fin_cooldown_e = planificador.ahora + self.tiempo_cooldown_e
         elif self.tiene_extensor and (self.en_suelo or self.sobre_plataforma or self.sobre_tuberia):
             self.extensor_recien_creado = True
-            self.cooldown_e = self.tiempo_cooldown_e
+            self.fin_cooldown_e = planificador.ahora + self.tiempo_cooldown_e
             return self.desequipar_extensor()
         
         return None
 
-    def _escalar_fotograma(self, fotograma: pygame.Surface) -> pygame.Surface:
-        return pygame.transform.scale(fotograma, (self.tamano_sprite, self.tamano_sprite))
-
     def _manejar_tecla_f(self, teclas: pygame.key.ScancodeWrapper, grupo_tuberias: pygame.sprite.Group | None) -> None:
         if self.soldando:
             return
@@ -500,7 +525,9 @@ class Jugador(SpriteConMascara):
             return
         self.soldando = True
         self.tuberia_objetivo_soldar = tuberia_objetivo
-        self.tiempo_soldadura_restante = self.tiempo_soldadura_total
+        self._temporizador_soldadura = planificador.reprogramar(
+            self._temporizador_soldadura, self.tiempo_soldadura_total, self._terminar_soldadura
+        )
         self.velocidad.x = 0.0
         self.velocidad.y = 0.0
         self._detener_sonido_movimiento()
@@ -510,8 +537,22 @@ class Jugador(SpriteConMascara):
         self.gestor_sonido.reproducir_efecto(self.clave_soldadura_inicio, reiniciar=True)
         self.gestor_sonido.reproducir_efecto(self.clave_soldadura_bucle, loops=-1, reiniciar=True)
 
+    def _terminar_soldadura(self) -> None:
+        self._temporizador_soldadura = None
+        if not self.soldando:
+            return
+        self.soldando = False
+        self.gestor_sonido.detener_efecto(self.clave_soldadura_bucle)
+        if isinstance(self.tuberia_objetivo_soldar, Tuberia):
+            try:
+                self.tuberia_objetivo_soldar.reparar()
+            except Exception:
+                pass
+        self.tuberia_objetivo_soldar = None
+        self.animador_actual = self.animador_andar
+
     def _buscar_tuberia_danada_cercana(self, grupo_tuberias: pygame.sprite.Group) -> Tuberia | None:
-        if self.mascara.count() == 0:
+        if self.contar_pixeles_mascara() == 0:
             return None
         mejor_tuberia: Tuberia | None = None
         mejor_distancia = float("inf")
@@ -0,0 +1,100 @@
+import pygame
+from typing import Iterable, NamedTuple
+
+from capa_estatica import CapaEstatica
+from indice_espacial import GrupoEspacial
+from particula import SistemaParticulas
+
+
+class ConteoRender(NamedTuple):
+    visibles: int
+    totales: int
+    bloques_estaticos: int = 0
+
+
+def sprites_visibles(
+    grupo: pygame.sprite.Group | None,
+    recta_camara: pygame.Rect,
+) -> list[pygame.sprite.Sprite]:
+    if not grupo:
+        return []
+    if isinstance(grupo, GrupoEspacial):
+        return grupo.sprites_en(recta_camara)
+    return [sprite for sprite in grupo if sprite.rect is not None and sprite.rect.colliderect(recta_camara)]
+
+
+def _dibujar_sprites(
+    pantalla: pygame.Surface,
+    sprites: Iterable[pygame.sprite.Sprite],
+    offset_x: float,
+    offset_y: float,
+    posiciones: dict[pygame.sprite.Sprite, tuple[float, float]] | None = None,
+) -> None:
+    for sprite in sprites:
+        x, y = posiciones.get(sprite, sprite.rect.topleft) if posiciones else sprite.rect.topleft
+        pantalla.blit(
+            sprite.image,
+            (int(x - offset_x), int(y - offset_y)),
+        )
+
+
+def dibujar_mundo(
+    pantalla: pygame.Surface,
+    desplazamiento_camara: pygame.math.Vector2,
+    grupo_plataformas: pygame.sprite.Group | None,
+    grupo_tuberias: pygame.sprite.Group | None,
+    sistema_particulas: SistemaParticulas | None,
+    grupo_extensores: pygame.sprite.Group | None,
+    capa_estatica: CapaEstatica | None = None,
+    posiciones: dict[pygame.sprite.Sprite, tuple[float, float]] | None = None,
+) -> ConteoRender:
+    """Dibuja solo lo que cae dentro de la camara y devuelve cuantos elementos se dibujaron.
+
+    Con `capa_estatica` las plataformas y tuberias quietas salen de sus bloques
+    pre-renderizados y aqui solo se dibujan las tuberias con fuga o en caida.
+    `posiciones` sustituye la posicion de los extensores por la interpolada.
+    """
+    offset_x = desplazamiento_camara.x
+    offset_y = desplazamiento_camara.y
+    recta_camara = pygame.Rect(int(offset_x), int(offset_y), pantalla.get_width(), pantalla.get_height())
+    visibles = 0
+    totales = 0
+    bloques_estaticos = 0
+
+    if capa_estatica is not None:
+        bloques_estaticos = capa_estatica.dibujar(pantalla, desplazamiento_camara)
+    else:
+        plataformas = sprites_visibles(grupo_plataformas, recta_camara)
+        _dibujar_sprites(pantalla, plataformas, offset_x, offset_y)
+        visibles += len(plataformas)
+    totales += len(grupo_plataformas) if grupo_plataformas else 0
+
+    tuberias = sprites_visibles(grupo_tuberias, recta_camara)
+    if capa_estatica is not None:
+        tuberias = [tuberia for tuberia in tuberias if not capa_estatica.es_estatico(tuberia)]
+    for tuberia in tuberias:
+        pantalla.blit(
+            tuberia.image,
+            (int(tuberia.rect.x - offset_x), int(tuberia.rect.y - offset_y)),
+        )
+        if hasattr(tuberia, "obtener_decal"):
+            resultado = tuberia.obtener_decal()
+            if resultado is not None:
+                decal_superficie, decal_rect = resultado
+                pantalla.blit(
+                    decal_superficie,
+                    (int(decal_rect.x - offset_x), int(decal_rect.y - offset_y)),
+                )
+    visibles += len(tuberias)
+    totales += len(grupo_tuberias) if grupo_tuberias else 0
+
+    if sistema_particulas:
+        visibles += sistema_particulas.dibujar(pantalla, (offset_x, offset_y), recta_camara)
+        totales += len(sistema_particulas)
+
+    extensores = sprites_visibles(grupo_extensores, recta_camara)
+    _dibujar_sprites(pantalla, extensores, offset_x, offset_y, posiciones)
+    visibles += len(extensores)
+    totales += len(grupo_extensores) if grupo_extensores else 0
+
+    return ConteoRender(visibles, totales, bloques_estaticos)
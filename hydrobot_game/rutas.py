@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -14,3 +15,8 @@ def ruta_relativa(*segmentos: str) -> str:
 
 def ruta_recurso(*segmentos: str) -> str:
     return ruta_relativa("recursos", *segmentos)
+
+
+def ruta_cache(*segmentos: str) -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return str(Path(base).joinpath("hydrobot", *segmentos))
@@ -2,15 +2,71 @@ import pygame
 from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
-    pass
+    from animador import PerfilColision
+    from cache_texturas import Repisa
+
+
+def altura_aterrizaje(
+    repisas: list[tuple[int, int, int]],
+    izquierda: int,
+    derecha: int,
+    fondo_previo: int,
+    fondo: int,
+) -> int | None:
+    """Altura de la repisa mas alta que el tramo [izquierda, derecha) ha cruzado bajando de `fondo_previo` a `fondo`."""
+    mejor: int | None = None
+    for repisa_izquierda, repisa_derecha, y in repisas:
+        if derecha <= repisa_izquierda or izquierda >= repisa_derecha:
+            continue
+        if fondo_previo <= y < fondo and (mejor is None or y < mejor):
+            mejor = y
+    return mejor
 
 
 class SpriteConMascara(pygame.sprite.Sprite):
     """Clase base para sprites que usan máscaras de colisión."""
-    
-    def obtener_recta_mascara(self) -> pygame.Rect:
+
+    _mascara_cacheada: pygame.mask.Mask | None = None
+    _tamano_cacheado: tuple[int, int] = (0, 0)
+    _recta_relativa_cacheada: pygame.Rect | None = None
+    _pixeles_cacheados = 0
+    _pies_relativos: tuple[int, int] | None = None
+    repisas: "tuple[Repisa, ...]" = ()
+
+    def establecer_mascara(self, mascara: pygame.mask.Mask, recta_relativa: pygame.Rect | None = None) -> None:
+        """Cambia la mascara; si se conoce su recta envolvente se reutiliza sin recalcularla."""
+        self.mascara = mascara
+        if recta_relativa is None:
+            self.invalidar_mascara()
+            return
+        rect: pygame.Rect = self.rect  # type: ignore[assignment]
+        self._mascara_cacheada = mascara
+        self._tamano_cacheado = rect.size
+        self._recta_relativa_cacheada = recta_relativa
+        self._pixeles_cacheados = -1
+        self._pies_relativos = None
+
+    def establecer_perfil(self, perfil: "PerfilColision") -> None:
+        """Usa un perfil precalculado: mascara, recta envolvente, pixeles y linea de pies."""
+        self.establecer_mascara(perfil.mascara, perfil.recta)
+        self._pixeles_cacheados = perfil.pixeles
+        self._pies_relativos = perfil.pies
+
+    def invalidar_mascara(self) -> None:
+        """Descarta los datos cacheados; llamar tras modificar la mascara en el sitio."""
+        self._mascara_cacheada = None
+        self._recta_relativa_cacheada = None
+        self._pies_relativos = None
+
+    def _recta_mascara_relativa(self) -> pygame.Rect:
         mascara: pygame.mask.Mask = self.mascara  # type: ignore[attr-defined]
         rect: pygame.Rect = self.rect  # type: ignore[assignment]
+        if (
+            self._recta_relativa_cacheada is not None
+            and self._mascara_cacheada is mascara
+            and self._tamano_cacheado == rect.size
+        ):
+            return self._recta_relativa_cacheada
         rectangulos: list[pygame.Rect] = cast(list[pygame.Rect], list(mascara.get_bounding_rects()))
         if rectangulos:
             recta_relativa = rectangulos[0].copy()
@@ -18,7 +74,36 @@ class SpriteConMascara(pygame.sprite.Sprite):
                 recta_relativa.union_ip(recta)
         else:
             recta_relativa = pygame.Rect(0, 0, rect.width, rect.height)
-        return recta_relativa.move(rect.topleft)
+        self._mascara_cacheada = mascara
+        self._tamano_cacheado = rect.size
+        self._recta_relativa_cacheada = recta_relativa
+        self._pixeles_cacheados = -1
+        self._pies_relativos = None
+        return recta_relativa
+
+    def obtener_recta_mascara(self) -> pygame.Rect:
+        rect: pygame.Rect = self.rect  # type: ignore[assignment]
+        return self._recta_mascara_relativa().move(rect.topleft)
+
+    def obtener_linea_pies(self) -> tuple[int, int, int]:
+        """Tramo (izquierda, derecha, y) sobre el que apoya el sprite, en coordenadas de mundo."""
+        rect: pygame.Rect = self.rect  # type: ignore[assignment]
+        recta_relativa = self._recta_mascara_relativa()
+        izquierda, derecha = self._pies_relativos or (recta_relativa.left, recta_relativa.right)
+        return rect.left + izquierda, rect.left + derecha, rect.top + recta_relativa.bottom
+
+    def obtener_repisas(self) -> list[tuple[int, int, int]]:
+        """Repisas compiladas (izquierda, derecha, y) en coordenadas de mundo; vacia si no es un tile estatico."""
+        if not self.repisas:
+            return []
+        rect: pygame.Rect = self.rect  # type: ignore[assignment]
+        return [(rect.left + izquierda, rect.left + derecha, rect.top + y) for izquierda, derecha, y in self.repisas]
+
+    def contar_pixeles_mascara(self) -> int:
+        self._recta_mascara_relativa()
+        if self._pixeles_cacheados < 0:
+            self._pixeles_cacheados = self.mascara.count()  # type: ignore[attr-defined]
+        return self._pixeles_cacheados
 
     def obtener_mascara(self) -> pygame.mask.Mask:
         return self.mascara # type: ignore[attr-defined]
@@ -0,0 +1,91 @@
+import heapq
+from typing import Callable
+
+
+class Temporizador:
+    """Plazo registrado en el planificador; `accion` se llama cuando vence, salvo si se cancela antes."""
+
+    __slots__ = ("instante", "accion", "cancelado", "disparado")
+
+    def __init__(self, instante: float, accion: Callable[[], None] | None) -> None:
+        self.instante = instante
+        self.accion = accion
+        self.cancelado = False
+        self.disparado = False
+
+    @property
+    def pendiente(self) -> bool:
+        return not self.cancelado and not self.disparado
+
+    def cancelar(self) -> None:
+        self.cancelado = True
+        self.accion = None
+
+
+class PlanificadorTemporizadores:
+    """Monticulo de plazos en tiempo de simulacion.
+
+    Las entidades registran cuando quieren despertar (escalar una rotura, emitir
+    particulas, terminar una soldadura...) y `avanzar` solo ejecuta los plazos
+    vencidos, asi que el coste por paso depende de cuantos vencen y no de cuantas
+    entidades hay. Los temporizadores cancelados se descartan al salir del monticulo.
+    """
+
+    def __init__(self) -> None:
+        self.ahora = 0.0
+        self.dt = 0.0
+        self._monticulo: list[tuple[float, int, Temporizador]] = []
+        self._secuencia = 0
+        self.disparados = 0
+
+    def __len__(self) -> int:
+        return len(self._monticulo)
+
+    def programar(self, retraso: float, accion: Callable[[], None] | None = None) -> Temporizador:
+        """Registra un plazo dentro de `retraso` segundos; como pronto vence en el siguiente `avanzar`."""
+        temporizador = Temporizador(self.ahora + max(0.0, retraso), accion)
+        heapq.heappush(self._monticulo, (temporizador.instante, self._secuencia, temporizador))
+        self._secuencia += 1
+        return temporizador
+
+    def reprogramar(
+        self,
+        temporizador: Temporizador | None,
+        retraso: float,
+        accion: Callable[[], None] | None = None,
+    ) -> Temporizador:
+        if temporizador is not None:
+            temporizador.cancelar()
+        return self.programar(retraso, accion)
+
+    def avanzar(self, dt: float) -> int:
+        """Adelanta el reloj `dt` segundos y ejecuta los plazos vencidos; devuelve cuantos se dispararon."""
+        self.dt = max(0.0, dt)
+        self.ahora += self.dt
+        # Se sacan todos antes de ejecutar: lo que se programe ahora espera al siguiente paso.
+        vencidos: list[Temporizador] = []
+        while self._monticulo and self._monticulo[0][0] <= self.ahora:
+            temporizador = heapq.heappop(self._monticulo)[2]
+            if temporizador.pendiente:
+                vencidos.append(temporizador)
+        for temporizador in vencidos:
+            if not temporizador.pendiente:
+                continue
+            temporizador.disparado = True
+            accion = temporizador.accion
+            temporizador.accion = None
+            if accion is not None:
+                accion()
+        self.disparados += len(vencidos)
+        return len(vencidos)
+
+    def limpiar(self) -> None:
+        for _, _, temporizador in self._monticulo:
+            temporizador.cancelar()
+        self._monticulo.clear()
+        self.ahora = 0.0
+        self.dt = 0.0
+        self.disparados = 0
+
+
+planificador = PlanificadorTemporizadores()
@@ -1,26 +1,29 @@
 import pygame
 import random
-from typing import TYPE_CHECKING, Optional, cast
+from typing import TYPE_CHECKING, Optional
+from atlas_decales import RUTAS_ROTO, ROTACIONES_DECAL, indice_decal, obtener_atlas_decales, variante_reparada
+from cache_texturas import obtener_textura_tile
 from sprite_base import SpriteConMascara
 from rutas import ruta_recurso
+from temporizador import Temporizador, planificador
 
 if TYPE_CHECKING:
     from gestor_sonido import GestorSonido
+    from particula import SistemaParticulas
 
 RUTA_TUBERIA = ruta_recurso("texturas", "obj_ecn", "tuberia_h.png")
-RUTA_ROTO1 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto1.png")
-RUTA_ROTO2 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto2.png")
-RUTA_ROTO3 = ruta_recurso("texturas", "obj_ecn", "particulas", "roto3.png")
 RUTA_SONIDO_AGUA = ruta_recurso("sonido", "efectos", "agua1.wav")
 RUTA_PARCHE1 = ruta_recurso("sonido", "efectos", "parche1.ogg")
 RUTA_PARCHE2 = ruta_recurso("sonido", "efectos", "parche2.ogg")
+INTERVALO_SONIDO_FUGA = 0.25
 
 
 class Tuberia(SpriteConMascara):
-    _tuberia_sonando: "Tuberia | None" = None
     _sonido_registrado = False
+    _contador_voces = 0
     CLAVE_SONIDO_AGUA = "sonido_agua_fuga"
     REDUCCION_SUPERIOR = 16
+    ESCALA = 7
 
     def __init__(
         self,
@@ -29,16 +32,16 @@ class Tuberia(SpriteConMascara):
         gestor_sonido: Optional["GestorSonido"] = None,
         *grupos: pygame.sprite.AbstractGroup,
         ruta_imagen: str | None = None,
+        sistema_particulas: Optional["SistemaParticulas"] = None,
     ) -> None:
         super().__init__(*grupos)
         ruta = ruta_imagen or RUTA_TUBERIA
-        self.imagen_original = pygame.image.load(ruta).convert_alpha()
-        ancho_escalado = int(self.imagen_original.get_width() * 7)
-        alto_escalado = int(self.imagen_original.get_height() * 7)
-        self.image = pygame.transform.scale(self.imagen_original, (ancho_escalado, alto_escalado))
+        textura = obtener_textura_tile(ruta, self.ESCALA, self.REDUCCION_SUPERIOR)
+        self.imagen_original = textura.imagen_original
+        self.image = textura.imagen
         self.rect: pygame.Rect = self.image.get_rect(topleft=posicion)
-        self.mascara = pygame.mask.from_surface(self.image)
-        self._reducir_mascara_superior(self.REDUCCION_SUPERIOR)
+        self.mascara = textura.mascara
+        self.repisas = textura.repisas
         self.posicion = pygame.math.Vector2(posicion)
         self.orientacion = "horizontal"
         self.requiere_caida = False
@@ -48,83 +51,98 @@ class Tuberia(SpriteConMascara):
         self.caida_completada = False
         self.danada = danada
         self.reparada = False
-        self.tiempo_particula = 0.0
+        self.sistema_particulas = sistema_particulas
         self.intervalo_particula = 0.2
-        self.decal_superficie: pygame.Surface | None = None
+        self.decal_indice: int | None = None
         self.decal_rect: pygame.Rect | None = None
         self.nivel_rotura = 1
         self.factor_particulas = 1
-        self.tiempo_danada = 0.0
         self.tiempo_para_escalar = 30.0
+        self._temporizador_escalar: Temporizador | None = None
+        self._temporizador_particula: Temporizador | None = None
+        self._temporizador_sonido: Temporizador | None = None
+        self._temporizador_caida: Temporizador | None = None
         self.gestor_sonido = gestor_sonido
         self.sonido_agua_en_bucle = False
         self.clave_sonido_agua = self.CLAVE_SONIDO_AGUA
+        # Todas comparten la configuracion del efecto; cada una pide su propia voz.
+        self.clave_voz_agua = f"{self.CLAVE_SONIDO_AGUA}_{Tuberia._contador_voces}"
+        Tuberia._contador_voces += 1
         if self.gestor_sonido and not Tuberia._sonido_registrado:
-            self.gestor_sonido.registrar_efecto(self.clave_sonido_agua, RUTA_SONIDO_AGUA, volumen=0.25)
+            self.gestor_sonido.registrar_efecto(self.clave_sonido_agua, RUTA_SONIDO_AGUA, volumen=0.25, categoria="fuga")
             Tuberia._sonido_registrado = True
         if self.danada:
             self._preparar_decal()
+            self._programar_fuga()
 
-    def _reducir_mascara_superior(self, reduccion: int) -> None:
-        if reduccion <= 0:
-            return
-        ancho, alto = self.mascara.get_size()
-        if ancho == 0 or alto == 0:
-            return
-        rectangulos = cast(list[pygame.Rect], list(self.mascara.get_bounding_rects()))
-        if not rectangulos:
+    def marcar_danada(self) -> None:
+        if self.danada:
             return
-        recta_colision = rectangulos[0].copy()
-        for recta in rectangulos[1:]:
-            recta_colision.union_ip(recta)
-        if recta_colision.height == 0:
+        self.danada = True
+        self.reparada = False
+        self._programar_fuga()
+
+    def _programar_fuga(self) -> None:
+        # La fuga no se revisa cada paso: el planificador la despierta en cada plazo.
+        self._temporizador_escalar = planificador.reprogramar(
+            self._temporizador_escalar, self.tiempo_para_escalar, self._al_escalar
+        )
+        self._temporizador_particula = planificador.reprogramar(
+            self._temporizador_particula, self.intervalo_particula, self._al_emitir
+        )
+        self._temporizador_sonido = planificador.reprogramar(self._temporizador_sonido, 0.0, self._al_refrescar_sonido)
+
+    def _cancelar_fuga(self) -> None:
+        for temporizador in (self._temporizador_escalar, self._temporizador_particula, self._temporizador_sonido):
+            if temporizador is not None:
+                temporizador.cancelar()
+        self._temporizador_escalar = None
+        self._temporizador_particula = None
+        self._temporizador_sonido = None
+
+    def _fuga_activa(self) -> bool:
+        return self.danada and not self.reparada and not self.en_caida
+
+    def _al_escalar(self) -> None:
+        if not self._fuga_activa():
             return
-        limite_superior = min(recta_colision.top + reduccion, recta_colision.bottom)
-        for posicion_y in range(recta_colision.top, limite_superior):
-            for posicion_x in range(recta_colision.left, recta_colision.right):
-                self.mascara.set_at((posicion_x, posicion_y), 0)
+        self._escalar_rotura()
+        self._temporizador_escalar = planificador.programar(self.tiempo_para_escalar, self._al_escalar)
 
-    def update(self, dt: float, grupo_particulas: pygame.sprite.Group | None = None) -> None:
-        if self.en_caida:
-            self._detener_sonido_agua()
-            if self.destino_caida_y is None:
-                self.en_caida = False
-                return
-            if self.posicion.y < self.destino_caida_y:
-                self.posicion.y = min(self.destino_caida_y, self.posicion.y + self.velocidad_caida * dt)
-                self.rect.y = int(self.posicion.y)
-            else:
-                self.posicion.y = float(self.destino_caida_y)
-                self.rect.y = int(self.destino_caida_y)
-                self.en_caida = False
-                self.caida_completada = True
+    def _al_emitir(self) -> None:
+        if not self._fuga_activa():
             return
+        if self.sistema_particulas is not None:
+            self.sistema_particulas.emitir(self.rect.center, self.factor_particulas, dispersion=12)
+        self._temporizador_particula = planificador.programar(self.intervalo_particula, self._al_emitir)
 
-        if not self.danada or self.reparada:
+    def _al_refrescar_sonido(self) -> None:
+        if not self._fuga_activa():
             self._detener_sonido_agua()
             return
-
         self._asegurar_sonido_agua()
+        self._temporizador_sonido = planificador.programar(INTERVALO_SONIDO_FUGA, self._al_refrescar_sonido)
 
-        self.tiempo_danada += dt
-        if self.tiempo_danada >= self.tiempo_para_escalar:
-            self.tiempo_danada = 0.0
-            self._escalar_rotura()
-
-        if grupo_particulas is None:
+    def _al_avanzar_caida(self) -> None:
+        self._temporizador_caida = None
+        if not self.en_caida:
             return
-        
-        self.tiempo_particula += dt
-        if self.tiempo_particula >= self.intervalo_particula:
-            self.tiempo_particula = 0.0
-            from particula import Particula
-            cantidad = self.factor_particulas
-            for _ in range(cantidad):
-                posicion_particula = (
-                    self.rect.centerx + random.randint(-12, 12),
-                    self.rect.centery + random.randint(-12, 12)
-                )
-                Particula(posicion_particula, grupo_particulas)
+        if self.destino_caida_y is None:
+            self.en_caida = False
+            return
+        if self.posicion.y < self.destino_caida_y:
+            self.posicion.y = min(self.destino_caida_y, self.posicion.y + self.velocidad_caida * planificador.dt)
+            self.rect.y = int(self.posicion.y)
+        else:
+            self.posicion.y = float(self.destino_caida_y)
+            self.rect.y = int(self.destino_caida_y)
+            self.en_caida = False
+            self.caida_completada = True
+        self._notificar_cambio()
+        if self.en_caida:
+            self._temporizador_caida = planificador.programar(0.0, self._al_avanzar_caida)
+        elif self._fuga_activa():
+            self._programar_fuga()
 
     def obtener_recta_reparacion(self) -> pygame.Rect:
         if not self.danada or self.decal_rect is None:
@@ -135,16 +153,18 @@ class Tuberia(SpriteConMascara):
         self.reparada = True
         self.danada = False
         
-        if self.decal_superficie and self.decal_rect:
-            self._convertir_decal_a_gris()
+        if self.decal_indice is not None:
+            self.decal_indice = variante_reparada(self.decal_indice)
         
-        self.tiempo_particula = 0.0
+        self._cancelar_fuga()
         self.nivel_rotura = 0
         self.factor_particulas = 0
-        self.tiempo_danada = 0.0
         self._detener_sonido_agua()
+        self._notificar_cambio()
         if self.gestor_sonido:
-            self.gestor_sonido.reproducir_efecto_puntual(random.choice([RUTA_PARCHE1, RUTA_PARCHE2]), volumen=0.5)
+            self.gestor_sonido.reproducir_efecto_puntual(
+                random.choice([RUTA_PARCHE1, RUTA_PARCHE2]), volumen=0.5, posicion=self.rect.center
+            )
 
     def iniciar_caida(self, altura_mundo: int) -> None:
         destino = max(0, altura_mundo - self.rect.height)
@@ -155,54 +175,54 @@ class Tuberia(SpriteConMascara):
             self.en_caida = False
             self.caida_completada = True
             self.requiere_caida = False
+            self._notificar_cambio()
             return
         self.en_caida = True
         self.requiere_caida = False
         self.caida_completada = False
+        self._detener_sonido_agua()
+        self._notificar_cambio()
+        self._temporizador_caida = planificador.reprogramar(self._temporizador_caida, 0.0, self._al_avanzar_caida)
+
+    def _notificar_cambio(self) -> None:
+        for grupo in self.groups():
+            if hasattr(grupo, "notificar_cambio"):
+                grupo.notificar_cambio(self)
+
+    def es_estatica(self) -> bool:
+        """Una tuberia es estatica si ni se mueve ni tiene una fuga animada."""
+        return not self.en_caida and (not self.danada or self.reparada)
+
+    @property
+    def decal_superficie(self) -> pygame.Surface | None:
+        return obtener_atlas_decales().obtener(self.decal_indice)
 
     def _preparar_decal(self, nivel: int | None = None) -> None:
-        rutas = [RUTA_ROTO1, RUTA_ROTO2, RUTA_ROTO3]
-        try:
-            if nivel is None:
-                ruta = random.choice(rutas)
-            else:
-                if nivel <= 1:
-                    ruta = RUTA_ROTO1
-                elif nivel == 2:
-                    ruta = RUTA_ROTO2
-                else:
-                    ruta = RUTA_ROTO3
-            imagen = pygame.image.load(ruta).convert_alpha()
-            rotacion = random.choice([0, 90, 180, 270])
-            imagen = pygame.transform.rotate(imagen, rotacion)
-            escala = 4
-            imagen = pygame.transform.scale(imagen, (imagen.get_width() * escala, imagen.get_height() * escala))
-            self.decal_superficie = imagen
-            self.decal_rect = imagen.get_rect(center=self.rect.center)
-            if "roto1" in ruta:
-                self.nivel_rotura = 1
-            elif "roto2" in ruta:
-                self.nivel_rotura = 2
-            elif "roto3" in ruta:
-                self.nivel_rotura = 3
-            else:
-                self.nivel_rotura = 1
-            self._calcular_factor_particulas()
-        except pygame.error:
-            self.decal_superficie = None
+        if nivel is None:
+            nivel = random.randrange(len(RUTAS_ROTO)) + 1
+        nivel = max(1, min(len(RUTAS_ROTO), nivel))
+        indice = indice_decal(nivel, random.randrange(len(ROTACIONES_DECAL)))
+        superficie = obtener_atlas_decales().obtener(indice)
+        if superficie is None:
+            self.decal_indice = None
             self.decal_rect = None
             self.nivel_rotura = 1
-            self._calcular_factor_particulas()
+        else:
+            self.decal_indice = indice
+            self.decal_rect = superficie.get_rect(center=self.rect.center)
+            self.nivel_rotura = nivel
+        self._calcular_factor_particulas()
 
     def obtener_decal(self) -> tuple[pygame.Surface, pygame.Rect] | None:
         if not self.danada and not self.reparada:
             return None
-        if self.decal_superficie is None or self.decal_rect is None:
+        if self.decal_indice is None or self.decal_rect is None:
             self._preparar_decal()
-        if self.decal_superficie is None or self.decal_rect is None:
+        superficie = self.decal_superficie
+        if superficie is None or self.decal_rect is None:
             return None
         self.decal_rect.center = self.rect.center
-        return self.decal_superficie, self.decal_rect
+        return superficie, self.decal_rect
 
     def _calcular_factor_particulas(self) -> None:
         # Ajustar densidad de fuga segun nivel (mas nivel -> mas particulas y menor intervalo)
@@ -225,52 +245,28 @@ class Tuberia(SpriteConMascara):
         self._calcular_factor_particulas()
 
     def _asegurar_sonido_agua(self) -> None:
+        # Cada fuga vuelve a pedir su voz cada INTERVALO_SONIDO_FUGA desde
+        # _al_refrescar_sonido; el gestor decide cuales suenan segun su presupuesto
+        # de fugas y la distancia a la camara, y puede quitarsela a otra.
         if not self.gestor_sonido:
             return
-        tuberia_activa = Tuberia._tuberia_sonando
-        if tuberia_activa and not tuberia_activa.alive():
-            tuberia_activa = None
-            Tuberia._tuberia_sonando = None
-        if tuberia_activa and tuberia_activa is not self:
-            if not tuberia_activa.danada or tuberia_activa.reparada:
-                tuberia_activa._detener_sonido_agua()
-                tuberia_activa = None
-            else:
-                self.sonido_agua_en_bucle = False
-                return
-        if Tuberia._tuberia_sonando is None:
-            Tuberia._tuberia_sonando = self
-        if Tuberia._tuberia_sonando is not self:
-            self.sonido_agua_en_bucle = False
-            return
-        if not self.sonido_agua_en_bucle:
-            canal = self.gestor_sonido.reproducir_efecto(self.clave_sonido_agua, loops=-1, reiniciar=True)
-            if canal:
-                self.sonido_agua_en_bucle = True
-        elif not self.gestor_sonido.esta_reproduciendo(self.clave_sonido_agua):
-            canal = self.gestor_sonido.reproducir_efecto(self.clave_sonido_agua, loops=-1, reiniciar=True)
-            if canal:
-                self.sonido_agua_en_bucle = True
+        canal = self.gestor_sonido.reproducir_efecto(
+            self.clave_sonido_agua,
+            loops=-1,
+            posicion=self.rect.center,
+            clave_voz=self.clave_voz_agua,
+        )
+        self.sonido_agua_en_bucle = canal is not None
 
     def _detener_sonido_agua(self) -> None:
-        if self.gestor_sonido and self.sonido_agua_en_bucle and Tuberia._tuberia_sonando is self:
-            self.gestor_sonido.detener_efecto(self.clave_sonido_agua)
-        if Tuberia._tuberia_sonando is self:
-            Tuberia._tuberia_sonando = None
+        if self.gestor_sonido and self.sonido_agua_en_bucle:
+            self.gestor_sonido.detener_efecto(self.clave_sonido_agua, self.clave_voz_agua)
         self.sonido_agua_en_bucle = False
 
-    def _convertir_decal_a_gris(self) -> None:
-        if not self.decal_superficie:
-            return
-        superficie_gris = self.decal_superficie.copy()
-        ancho, alto = superficie_gris.get_size()
-        superficie_gris.lock()
-        for x in range(ancho):
-            for y in range(alto):
-                color = superficie_gris.get_at((x, y))
-                if color.a > 0:
-                    gris_base = int(color.r * 0.299 + color.g * 0.587 + color.b * 0.114)
-                    gris_claro = min(255, int(gris_base * 0.4 + 150))
-                    superficie_gris.set_at((x, y), (gris_claro, gris_claro, gris_claro, color.a))
-        superficie_gris.unlock()
-        self.decal_superficie = superficie_gris
+    def kill(self) -> None:
+        self._cancelar_fuga()
+        if self._temporizador_caida is not None:
+            self._temporizador_caida.cancelar()
+            self._temporizador_caida = None
+        self._detener_sonido_agua()
+        super().kill()
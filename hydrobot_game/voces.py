@@ -0,0 +1,167 @@
+import math
+
+import pygame
+
+# categoria: (prioridad, voces simultaneas como maximo)
+CATEGORIAS_VOZ: dict[str, tuple[int, int]] = {
+    "soldadura": (4, 2),
+    "robot": (3, 2),
+    "general": (2, 6),
+    "extensor": (1, 3),
+    "fuga": (0, 4),
+}
+CATEGORIA_POR_DEFECTO = "general"
+ALCANCE_AUDIBLE = 900.0
+
+
+class Voz:
+    __slots__ = ("clave", "categoria", "canal", "posicion", "volumen")
+
+    def __init__(
+        self,
+        clave: str,
+        categoria: str,
+        canal: pygame.mixer.Channel,
+        posicion: tuple[float, float] | None,
+        volumen: float,
+    ) -> None:
+        self.clave = clave
+        self.categoria = categoria
+        self.canal = canal
+        self.posicion = posicion
+        self.volumen = volumen
+
+
+class GestorVoces:
+    """Reparte los canales no reservados del mixer entre los efectos que quieren sonar.
+
+    Cada categoria tiene una prioridad y un maximo de voces. Si la categoria o el
+    conjunto de canales esta lleno, la peticion le quita el canal a la voz menos
+    importante (prioridad de su categoria mas cercania a la camara) solo si la
+    nueva es mas importante; si no, se rechaza. Los efectos posicionales se
+    atenuan con la distancia y dejan de sonar fuera de `alcance`.
+    """
+
+    def __init__(self, primer_canal: int, total_canales: int, alcance: float = ALCANCE_AUDIBLE) -> None:
+        self.canales: list[pygame.mixer.Channel] = []
+        for indice in range(primer_canal, total_canales):
+            try:
+                self.canales.append(pygame.mixer.Channel(indice))
+            except pygame.error:
+                break
+        self.alcance = alcance
+        self.oyente: tuple[float, float] | None = None
+        self.voces: dict[str, Voz] = {}
+        self._voz_por_canal: dict[pygame.mixer.Channel, Voz] = {}
+        self.robadas = 0
+        self.rechazadas = 0
+
+    def establecer_oyente(self, posicion: tuple[float, float] | None) -> None:
+        self.oyente = posicion
+
+    def atenuacion(self, posicion: tuple[float, float] | None) -> float:
+        if posicion is None or self.oyente is None:
+            return 1.0
+        distancia = math.hypot(posicion[0] - self.oyente[0], posicion[1] - self.oyente[1])
+        return max(0.0, 1.0 - distancia / self.alcance)
+
+    def _importancia(self, categoria: str, posicion: tuple[float, float] | None) -> float:
+        prioridad = CATEGORIAS_VOZ.get(categoria, CATEGORIAS_VOZ[CATEGORIA_POR_DEFECTO])[0]
+        return prioridad + self.atenuacion(posicion)
+
+    def _importancia_voz(self, voz: Voz) -> float:
+        return self._importancia(voz.categoria, voz.posicion)
+
+    def _olvidar(self, voz: Voz) -> None:
+        self.voces.pop(voz.clave, None)
+        if self._voz_por_canal.get(voz.canal) is voz:
+            del self._voz_por_canal[voz.canal]
+
+    def voz_activa(self, clave: str) -> Voz | None:
+        voz = self.voces.get(clave)
+        if voz is None:
+            return None
+        if not voz.canal.get_busy() or self._voz_por_canal.get(voz.canal) is not voz:
+            self._olvidar(voz)
+            return None
+        return voz
+
+    def _liberar(self, voz: Voz) -> pygame.mixer.Channel:
+        voz.canal.stop()
+        self._olvidar(voz)
+        return voz.canal
+
+    def _canal_libre(self) -> pygame.mixer.Channel | None:
+        for canal in self.canales:
+            voz = self._voz_por_canal.get(canal)
+            if voz is not None and canal.get_busy():
+                continue
+            if voz is not None:
+                self._olvidar(voz)
+            if not canal.get_busy():
+                return canal
+        return None
+
+    def _robar(self, candidatas: list[Voz], importancia: float) -> pygame.mixer.Channel | None:
+        if not candidatas:
+            return None
+        victima = min(candidatas, key=self._importancia_voz)
+        if self._importancia_voz(victima) >= importancia:
+            return None
+        self.robadas += 1
+        return self._liberar(victima)
+
+    def asignar(
+        self,
+        clave: str,
+        categoria: str,
+        posicion: tuple[float, float] | None = None,
+        volumen: float = 1.0,
+    ) -> pygame.mixer.Channel | None:
+        """Devuelve el canal de la voz `clave`, creando la voz si hay sitio o si puede robarlo."""
+        voz = self.voz_activa(clave)
+        if voz is not None:
+            voz.posicion = posicion
+            voz.volumen = volumen
+            return voz.canal
+        if self.atenuacion(posicion) <= 0.0:
+            return None
+        importancia = self._importancia(categoria, posicion)
+        maximo = CATEGORIAS_VOZ.get(categoria, CATEGORIAS_VOZ[CATEGORIA_POR_DEFECTO])[1]
+        activas = [voz for voz in list(self.voces.values()) if self.voz_activa(voz.clave) is not None]
+        misma_categoria = [voz for voz in activas if voz.categoria == categoria]
+        if len(misma_categoria) >= maximo:
+            canal = self._robar(misma_categoria, importancia)
+        else:
+            canal = self._canal_libre() or self._robar(activas, importancia)
+        if canal is None:
+            self.rechazadas += 1
+            return None
+        voz = Voz(clave, categoria, canal, posicion, volumen)
+        self.voces[clave] = voz
+        self._voz_por_canal[canal] = voz
+        return canal
+
+    def liberar(self, clave: str) -> None:
+        voz = self.voces.get(clave)
+        if voz is not None:
+            self._liberar(voz)
+
+    def volumen_canal(self, clave: str) -> float:
+        voz = self.voces.get(clave)
+        if voz is None:
+            return 0.0
+        return voz.volumen * self.atenuacion(voz.posicion)
+
+    def actualizar(self) -> None:
+        """Reajusta el volumen de las voces posicionales y corta las que ya no se oyen."""
+        for voz in list(self.voces.values()):
+            if self.voz_activa(voz.clave) is None:
+                continue
+            if voz.posicion is None:
+                continue
+            atenuacion = self.atenuacion(voz.posicion)
+            if atenuacion <= 0.0:
+                self._liberar(voz)
+            else:
+                voz.canal.set_volume(voz.volumen * atenuacion)